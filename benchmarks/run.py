@@ -0,0 +1,191 @@
+"""Headless benchmark of the events pipeline.
+
+    python -m benchmarks.run                       # 100, 10k and 1M rows
+    python -m benchmarks.run --sizes 100 10000 --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Each stage runs ``--repeat`` times for latency (p50/p95) and throughput
+(rows/s at the median), then once more under tracemalloc for peak memory.
+``--compare`` exits non-zero when a stage's p50 exceeds the baseline by more
+than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_events
+from events_core.buckets import Sections
+from events_core.day_index import DayIndex
+from events_core.pdf import export_pdf
+from events_core.query import EventQuery, PreparedEvents
+from events_core.render import section_html
+from events_core.schema import day_to_date
+from events_core.search import SearchIndex
+from events_core.storage import CsvStore, SqliteStore
+from events_core.sync import LiveEvents
+
+DEFAULT_SIZES = [100, 10_000, 1_000_000]
+
+# Views render this many cards per page (PAGE_SIZE in events.py)
+PAGE_ROWS = 120
+
+
+# ==================================================
+# STAGES
+# ==================================================
+def _filter_chain(prep, index, today):
+    query = EventQuery(program="KEAM", end_from=today, search="allot")
+    return query.apply(prep, index)
+
+def _sections_view(df, kind, columns):
+    # As render_sections() in events.py, plus building the per-version table
+    sections = Sections(df)
+    return [section_html(title, df.iloc[lo:hi], columns)
+            for title, lo, hi in sections.slices(kind, PAGE_ROWS)]
+
+def _calendar(df, month_start):
+    index = DayIndex(df)
+    first = month_start - timedelta(days=(month_start.weekday() + 1) % 7)
+    return [index.positions_on(first + timedelta(days=i)) for i in range(42)]
+
+def _delta_sync(live, event_id):
+    live.store.update(event_id, {"Category": "Result"})
+    return live.sync()
+
+def build_stages(df, workdir, pdf_max_rows):
+    """[(name, fn)] for a frame; files are written to workdir"""
+    csv_path = os.path.join(workdir, "events.csv")
+    db_path = os.path.join(workdir, "events.db")
+    CsvStore(csv_path).replace_all(df)
+    SqliteStore(db_path).replace_all(df)
+
+    prep = PreparedEvents(df)
+    view = prep.df
+    index = SearchIndex(view)
+    today = day_to_date(view["Start Date"].iloc[len(view) // 2])
+    month_start = today.replace(day=1)
+    live = LiveEvents(SqliteStore(db_path))
+    edited = int(df["EventID"].iloc[0])
+
+    stages = [
+        ("load_csv", lambda: CsvStore(csv_path).load()),
+        ("load_sqlite", lambda: SqliteStore(db_path).load()),
+        ("query_sqlite", lambda: SqliteStore(db_path).query(program="KEAM", end_from=today)),
+        ("prepare", lambda: PreparedEvents(df)),
+        ("search_index", lambda: SearchIndex(view)),
+        ("delta_sync", lambda: _delta_sync(live, edited)),
+        ("filter", lambda: _filter_chain(prep, index, today)),
+        ("view_cards", lambda: _sections_view(view, "month", 6)),
+        ("view_weekly", lambda: _sections_view(view, "week", 3)),
+        ("calendar", lambda: _calendar(view, month_start)),
+    ]
+    if len(view) <= pdf_max_rows:
+        stages.append(("export_pdf", lambda: export_pdf(view)))
+    return stages
+
+
+# ==================================================
+# MEASUREMENT
+# ==================================================
+def measure(fn, rows, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    p50 = float(np.percentile(times, 50))
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(float(np.percentile(times, 95)) * 1000, 3),
+        "rows_per_s": round(rows / p50, 1) if p50 else None,
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+def run(sizes, repeat, pdf_max_rows, seed=0, log=print):
+    results = {}
+    for n in sizes:
+        df = generate_events(n, seed=seed)
+        with tempfile.TemporaryDirectory() as workdir:
+            stages = build_stages(df, workdir, pdf_max_rows)
+            results[str(n)] = {}
+            for name, fn in stages:
+                # Fewer repeats for the big sizes keeps the 1M run in minutes
+                reps = max(1, repeat if n <= 10_000 else repeat // 3)
+                results[str(n)][name] = stat = measure(fn, n, reps)
+                log(f"{n:>9} {name:<14} p50 {stat['p50_ms']:>10.2f} ms"
+                    f"  p95 {stat['p95_ms']:>10.2f} ms"
+                    f"  {stat['rows_per_s'] or 0:>14,.0f} rows/s"
+                    f"  peak {stat['peak_mb']:>8.2f} MB")
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance):
+    """Lines describing stages slower than baseline p50 * (1 + tolerance)"""
+    regressions = []
+    for size, stages in current["results"].items():
+        for name, stat in stages.items():
+            base = baseline["results"].get(size, {}).get(name)
+            if not base or not base["p50_ms"]:
+                continue
+            ratio = stat["p50_ms"] / base["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{size} {name}: {base['p50_ms']} ms -> "
+                                   f"{stat['p50_ms']} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--pdf-max-rows", type=int, default=10_000,
+                        help="skip export_pdf above this many rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.pdf_max_rows, args.seed)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Deterministic synthetic events for benchmarks.
+
+Rows come in admission cycles: one program, one season, the seven categories
+in their usual order with realistic offsets and durations (application
+windows run for weeks, lists and allotments are single days). Seasons start
+between April and July and are spread over ``years`` admission years.
+"""
+import numpy as np
+import pandas as pd
+
+from events_core.schema import CATEGORIES, COLUMNS, PROGRAMS, apply_schema
+
+# category -> (days after season start, (min, max) duration in days)
+CATEGORY_PLAN = {
+    "Online Application": (0, (14, 30)),
+    "Memo Clearance": (35, (3, 7)),
+    "Option Registration": (45, (3, 10)),
+    "Provisional Category List": (60, (0, 0)),
+    "Provisional Rank List": (65, (0, 0)),
+    "Provisional Allotment": (75, (0, 1)),
+    "Final Allotment": (85, (0, 1)),
+}
+
+ALL_DAY_SHARE = 0.25
+
+
+def slot_labels():
+    """'12:00 AM' ... '11:30 PM' for the 48 half-hour slots"""
+    labels = []
+    for slot in range(48):
+        h, m = divmod(slot * 30, 60)
+        labels.append(f"{(h + 11) % 12 + 1}:{m:02d} {'AM' if h < 12 else 'PM'}")
+    return np.array(labels, dtype=object)
+
+def generate_events(n, seed=0, start_year=2020, years=10):
+    """Typed events frame (see events_core.schema) with n rows"""
+    rng = np.random.default_rng(seed)
+    idx = np.arange(n)
+    cycle = idx // len(CATEGORIES)
+    n_cycles = int(cycle[-1]) + 1 if n else 0
+
+    cat_idx = idx % len(CATEGORIES)
+    offsets = np.array([CATEGORY_PLAN[c][0] for c in CATEGORIES])
+    min_len = np.array([CATEGORY_PLAN[c][1][0] for c in CATEGORIES])
+    max_len = np.array([CATEGORY_PLAN[c][1][1] for c in CATEGORIES])
+
+    cycle_program = rng.integers(0, len(PROGRAMS), n_cycles)
+    cycle_year = start_year + rng.integers(0, years, n_cycles)
+    cycle_day = rng.integers(90, 182, n_cycles)  # ~April 1 .. July 1
+    season = (pd.to_datetime(cycle_year.astype(str), format="%Y")
+              + pd.to_timedelta(cycle_day, unit="D")).to_numpy()
+
+    jitter = rng.integers(-3, 4, n)
+    start = season[cycle] + pd.to_timedelta(offsets[cat_idx] + jitter, unit="D").to_numpy()
+    duration = rng.integers(min_len[cat_idx], max_len[cat_idx] + 1)
+    end = start + pd.to_timedelta(duration, unit="D").to_numpy()
+
+    labels = slot_labels()
+    all_day = rng.random(n) < ALL_DAY_SHARE
+    start_slot = rng.integers(18, 25, n)  # 9:00 AM .. 12:00 PM
+    end_slot = np.minimum(start_slot + rng.integers(4, 17, n), 47)
+    start_time = np.where(all_day, "", labels[start_slot])
+    end_time = np.where(all_day, "", labels[end_slot])
+
+    df = pd.DataFrame({
+        "EventID": idx + 1,
+        "Program": np.array(PROGRAMS, dtype=object)[cycle_program[cycle]],
+        "Category": np.array(CATEGORIES, dtype=object)[cat_idx],
+        "Start Date": start,
+        "End Date": end,
+        "Start Time": start_time,
+        "End Time": end_time,
+        "All Day": np.where(all_day, "True", "False"),
+        "Version": 1,
+    })
+    return apply_schema(df[COLUMNS])
@@ -1,57 +1,418 @@
 import streamlit as st
 import pandas as pd
-from datetime import date, time, timedelta
-from reportlab.platypus import SimpleDocTemplate, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
+import os
 import io
+import json
+import time as _time
+from datetime import date, timedelta
+from functools import partial
+from html import escape
+from events_core.archive import (
+    Archive, archive_events, default_cutoff, needs_archive, restore_year, with_archive,
+)
+from events_core.buckets import Sections
+from events_core.bulk import FORMATS, export_events, format_of, read_table, validate
+from events_core.conflicts import ConflictIndex, find_overlaps
+from events_core.day_index import DayIndex
+from events_core.ics import export_ics
+from events_core.jobs import JobRunner
+from events_core.query import EventQuery, PreparedEvents
+from events_core.profiling import RerunProfile, observe, prometheus_text, write_prometheus
+from events_core.render import section_html
+from events_core.search import CombinedIndex, SearchIndex
+from events_core.series import Series, SeriesStore, instantiate, make_template, series_events
+from events_core.stats import CombinedStats
+from events_core.schema import (
+    CATEGORIES, PROGRAMS, concat_typed, day_to_date, format_12h, to_day, to_text_frame,
+)
+from events_core.storage import StaleEventError, open_store
+from events_core.sync import LiveEvents
+from events_core.timeslots import (
+    DEFAULT_END_SLOT, DEFAULT_START_SLOT, LABEL_MINUTES, LABEL_TIME, SLOT_LABELS, nearest_slot,
+)
 
 # ==================================================
 # CONFIG
 # ==================================================
 st.set_page_config(page_title="Admission Events", layout="wide")
-DATA_FILE = "events.csv"
-
-PROGRAMS = [
-    "KEAM", "LLB 3 Year", "LLB 5 Year", "LLM",
-    "PG Ayurveda", "PG Homoeo", "PG Nursing"
-]
-
-CATEGORIES = [
-    "Online Application",
-    "Memo Clearance",
-    "Option Registration",
-    "Provisional Category List",
-    "Provisional Rank List",
-    "Provisional Allotment",
-    "Final Allotment"
-]
-
-COLUMNS = [
-    "EventID", "Program", "Category",
-    "Start Date", "End Date",
-    "Start Time", "End Time", "All Day"
-]
+# events.csv, or a .db/.sqlite file for the SQLite backend
+# (migrate once with: python -m events_core.storage events.csv events.db)
+DATA_FILE = os.environ.get("EVENTS_DATA_FILE", "events.csv")
+
+# Cards shown per "Load more" step in the Cards/Weekly/Monthly views
+PAGE_SIZE = 120
+
+# Rows per page of the admin event grid
+ADMIN_PAGE_SIZE = 50
+
+# Overlapping pairs listed at most in the admin overlap report
+OVERLAP_LIMIT = 500
+
+# Exports of more rows than this are built by a background job, with
+# progress, instead of inside the rerun that serves the download
+JOB_EXPORT_ROWS = 2000
+
+EXPORT_FILES = {
+    "pdf": ("events.pdf", "application/pdf"),
+    "ics": ("events.ics", "text/calendar"),
+    "csv": ("events.csv", "text/csv"),
+    "json": ("events.json", "application/json"),
+}
+
+# Rerun profiling: on by default with EVENTS_PROFILE=1, toggled in the debug panel.
+# EVENTS_METRICS_FILE receives Prometheus text after every profiled rerun.
+PROFILE = os.environ.get("EVENTS_PROFILE", "") not in ("", "0")
+METRICS_FILE = os.environ.get("EVENTS_METRICS_FILE")
 
 # ==================================================
 # SESSION
 # ==================================================
 st.session_state.setdefault("page", "user")
-st.session_state.setdefault("edit_idx", None)
+st.session_state.setdefault("edit_id", None)
+st.session_state.setdefault("edit_version", None)
+st.session_state.setdefault("admin_page", 1)
+st.session_state.setdefault("show_limit", PAGE_SIZE)
+st.session_state.setdefault("shown_for", None)
+st.session_state.setdefault("profile", PROFILE)
+# Bumped after an import so the uploader starts empty again
+st.session_state.setdefault("upload_round", 0)
+st.session_state.setdefault("imported", None)
+# Shown once on the admin page after an edit that kept existing overlaps
+st.session_state.setdefault("overlap_notice", None)
 
 # ==================================================
 # DATA
 # ==================================================
-def load_events():
+@st.cache_resource(show_spinner=False)
+def get_store(path):
+    """CSV or SQLite backend, chosen by the DATA_FILE suffix"""
+    return open_store(path)
+
+@st.cache_resource(show_spinner=False)
+def _live(path):
+    """Events of path kept current from the store's change journal"""
+    return LiveEvents(get_store(path))
+
+@st.cache_resource(show_spinner=False)
+def _archive(path):
+    """Year partitions of past cycles; opened only when a view needs them"""
+    return Archive(path)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _archive_horizon(path, archive_version):
+    return _archive(path).horizon
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _archive_stats(path, archive_version):
+    """Counts of the archived events, read from the archive manifest"""
+    return _archive(path).stats()
+
+@st.cache_resource(max_entries=2, show_spinner="Loading archived events...")
+def _archived_events(path, archive_version):
+    return _archive(path).load()
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _archived_search(path, archive_version):
+    return SearchIndex(_archived_events(path, archive_version))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _read_events(path, version):
+    """The live frame at a data version; shared by every session"""
+    return _live(path).df
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _prepared(path, version):
+    """Valid events sorted by start, with lookup structures"""
+    return PreparedEvents(_read_events(path, version))
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _prepared_all(path, version):
+    """_prepared() over the live and the archived events"""
+    return PreparedEvents(with_archive(_read_events(path, version),
+                                       _archived_events(path, version[1])))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _event_lookup(path, version):
+    """EventID -> row position in the loaded frame"""
+    df = _read_events(path, version)
+    return dict(zip(df["EventID"].tolist(), range(len(df))))
+
+@st.cache_resource(show_spinner=False)
+def _series_store(path):
+    return SeriesStore(path)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _series(path, series_version):
+    """Recurring series definitions (not their occurrences)"""
+    return _series_store(path).series()
+
+def _stored_matches(path, version, query):
+    # Archived events are loaded only for queries that can match them
+    if not needs_archive(query, _archive_horizon(path, version[1])):
+        return query.apply(_prepared(path, version), _live(path).search)
+    index = _live(path).search
+    if query.search.strip():
+        index = CombinedIndex(index, _archived_search(path, version[1]))
+    return query.apply(_prepared_all(path, version), index)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _filtered_events(path, version, query):
+    """All filters of an EventQuery, resolved in one pass, plus the series
+    occurrences in the query's date window"""
+    df = _stored_matches(path, version, query)
+    if version[2] is None:
+        return df
+    occ = series_events(_series(path, version[2]), query)
+    if occ.empty:
+        return df
+    return concat_typed([df, occ]).sort_values("Start Date", kind="stable").reset_index(drop=True)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _day_index(path, version, query):
+    """Calendar lookup, built once per filtered set"""
+    return DayIndex(_filtered_events(path, version, query))
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _sections(path, version, query):
+    """Month/week bucket offsets of a filtered set, built once per data version"""
+    return Sections(_filtered_events(path, version, query))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _conflict_index(path, version):
+    """Sorted intervals for checking a new or edited event"""
+    return ConflictIndex(_prepared(path, version).df)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _overlaps(path, version, scope):
+    """Overlapping event pairs per scope (sweep over the sorted intervals)"""
+    return find_overlaps(_prepared(path, version).df, scope, limit=OVERLAP_LIMIT)
+
+@st.cache_resource(show_spinner=False)
+def _jobs():
+    """Background runner for large exports, shared by every session"""
+    return JobRunner()
+
+def _export_source(path, version, query):
+    """filtered_events(query), or every live event for query None"""
+    if query is None:
+        return _read_events(path, version)
+    return _filtered_events(path, version, query)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _text_events(path, version, query):
+    """_export_source() as display strings, for the debug tables"""
+    return to_text_frame(_export_source(path, version, query))
+
+def _build_export(df, fmt, progress=None):
+    # Also runs on job threads: no Streamlit calls here
+    t0 = _time.perf_counter()
+    if fmt == "pdf":
+        # ReportLab is only imported once someone actually downloads a PDF
+        from events_core.pdf import export_pdf
+        data = export_pdf(df, progress)
+    elif fmt == "ics":
+        data = export_ics(df)
+    else:
+        out = io.StringIO()
+        export_events(df, out, fmt)
+        data = out.getvalue()
+    observe(fmt, _time.perf_counter() - t0)
+    return data
+
+@st.cache_data(max_entries=16, show_spinner="Exporting...")
+def _export_data(path, version, query, fmt):
+    """One build per (data version, filter state, format)"""
+    return _build_export(_export_source(path, version, query), fmt)
+
+def data_version():
+    """Apply store changes since the last call; the cache key for derived views
+    is (live token, archive version, series version)"""
+    return (_live(DATA_FILE).sync(), _archive(DATA_FILE).version(),
+            _series_store(DATA_FILE).version())
+
+def archived_count():
+    """Number of events in the archive (read from its manifest)"""
+    version = data_version()[1]
+    return 0 if version is None else _archive_stats(DATA_FILE, version).total
+
+def load_events(version=None):
+    """Cached, typed events frame. Shared across sessions - treat as read-only,
+    call .copy() before mutating.
+
+    A page resolves data_version() once per rerun and passes it here and to
+    the views below, so row positions and section offsets refer to the
+    frame it already holds."""
+    return _read_events(DATA_FILE, version or data_version())
+
+def prepared_events(version=None):
+    """load_events() with valid dates only, sorted by Start Date"""
+    return _prepared(DATA_FILE, version or data_version()).df
+
+def filtered_events(query, version=None):
+    """Events matching an EventQuery; memoized per (data version, query)"""
+    return _filtered_events(DATA_FILE, version or data_version(), query)
+
+def exported(fmt, query=None):
+    """filtered_events(query), or every event for None, as pdf, ics, csv or json"""
+    return _export_data(DATA_FILE, data_version(), query, fmt)
+
+def export_job(fmt, query=None, start=False):
+    """Background job building exported(fmt, query) for the current data; with
+    start=True it is submitted unless the same export is already known"""
+    version = data_version()
+    key = (DATA_FILE, version, query, fmt)
+    if not start:
+        return _jobs().get(key)
+    return _jobs().submit(key, _build_export, _export_source(DATA_FILE, version, query), fmt)
+
+def text_events(query=None, version=None):
+    """filtered_events(query), or every event for None, with dates and times as text"""
+    return _text_events(DATA_FILE, version or data_version(), query)
+
+def day_index(query, version=None):
+    """DayIndex over filtered_events(query)"""
+    return _day_index(DATA_FILE, version or data_version(), query)
+
+def sections(query, version=None):
+    """Sections over filtered_events(query)"""
+    return _sections(DATA_FILE, version or data_version(), query)
+
+def event_by_id(event_id):
+    """Typed row of an event, or None if it does not exist"""
+    version = data_version()
+    pos = _event_lookup(DATA_FILE, version).get(int(event_id))
+    return None if pos is None else _read_events(DATA_FILE, version).iloc[pos]
+
+def admin_positions(search, version=None):
+    """Row positions in load_events(version) for the admin grid: an exact
+    EventID first, then search matches best first (None when search is blank)"""
+    version = version or data_version()
+    lookup = _event_lookup(DATA_FILE, version)
+    search = search.strip()
+    if not search:
+        return None
+    ids = _live(DATA_FILE).search.search(search)
+    if search.isdigit() and int(search) in lookup:
+        ids = [int(search)] + [i for i in ids if i != int(search)]
+    # The live index may already hold events inserted after version was read
+    return [lookup[i] for i in ids if i in lookup]
+
+def schedule_conflicts(event):
+    """Existing events of the same category overlapping event"""
+    return _conflict_index(DATA_FILE, data_version()).conflicts(event)
+
+def overlaps(scope):
+    """Up to OVERLAP_LIMIT overlapping pairs; scope is global, program or category"""
+    return _overlaps(DATA_FILE, data_version(), scope)
+
+def event_stats():
+    """Statistics aggregates, updated from the journal like the frame, plus
+    the archived events' counts"""
+    version = data_version()
+    stats = _live(DATA_FILE).stats
+    if version[1] is None:
+        return stats
+    return CombinedStats(stats, _archive_stats(DATA_FILE, version[1]))
+
+def _written():
+    # Pick up our own change now; views keyed on the old version age out
+    data_version()
+
+def add_event(event):
+    event_id = get_store(DATA_FILE).insert(event)
+    _written()
+    return event_id
+
+def update_event(event_id, changes, version=None):
+    update_events([event_id], changes, None if version is None else [version])
+
+def update_events(event_ids, changes, versions=None):
+    """Apply the same changes to every listed event in one write.
+    With versions (as last seen), raises StaleEventError if any row changed since."""
     try:
-        return pd.read_csv(DATA_FILE)
-    except FileNotFoundError:
-        return pd.DataFrame(columns=COLUMNS)
+        get_store(DATA_FILE).update_many(event_ids, changes, versions)
+    finally:
+        _written()
 
-def save_events(df):
-    df.to_csv(DATA_FILE, index=False)
+def delete_events(event_ids, versions=None):
+    try:
+        get_store(DATA_FILE).delete(event_ids, versions)
+    finally:
+        _written()
 
-def next_id(df):
-    return 1 if df.empty else int(df["EventID"].max()) + 1
+def import_events(df):
+    """Insert a validated typed frame in one batch; returns the new EventIDs"""
+    ids = get_store(DATA_FILE).insert_many(df)
+    _written()
+    return ids
+
+def archive_past_events(before):
+    """Move events that ended before ``before`` to the archive; returns how many"""
+    try:
+        return archive_events(get_store(DATA_FILE), before)
+    finally:
+        _written()
+
+def add_series(series):
+    """Store a recurring series; returns its series id"""
+    return _series_store(DATA_FILE).add(series)
+
+def remove_series(series_id):
+    _series_store(DATA_FILE).remove(series_id)
+
+def save_template(name, events):
+    """Keep the Category sequence of a cycle's typed events under name"""
+    _series_store(DATA_FILE).save_template(name, make_template(events))
+
+def remove_template(name):
+    _series_store(DATA_FILE).remove_template(name)
+
+def apply_template(name, program, start):
+    """Insert a saved template's events for program from start; returns the new EventIDs"""
+    steps = _series_store(DATA_FILE).templates()[name]
+    return import_events(instantiate(steps, program, start))
+
+def restore_archived(year):
+    n = restore_year(get_store(DATA_FILE), year)
+    _written()
+    return n
+
+def show_conflicts(clashes):
+    st.warning(f"This event overlaps {len(clashes)} event(s) of the same category. "
+               "Tick \"Save even if it overlaps\" to save it anyway.")
+    st.dataframe(to_text_frame(clashes.head(20)), hide_index=True)
+
+@st.fragment(run_every=1)
+def _export_progress(fmt, query):
+    job = export_job(fmt, query)
+    if job is None or job.finished:
+        st.rerun()
+    st.progress(job.progress, text=f"Preparing {EXPORT_FILES[fmt][0]}...")
+
+def export_button(label, fmt, query=None, rows=0):
+    """Download button for exported(fmt, query). Exports of more than
+    JOB_EXPORT_ROWS rows are prepared as a background job on request."""
+    name, mime = EXPORT_FILES[fmt]
+    if rows <= JOB_EXPORT_ROWS:
+        # Built only when the button is clicked, then cached per filter state
+        st.download_button(label, partial(exported, fmt, query), name, mime=mime,
+                           on_click="ignore")
+        return
+    job = export_job(fmt, query)
+    if job is None or job.state == "failed":
+        if job is not None:
+            st.error(f"Building {name} failed: {job.error}")
+        if not st.button(f"Prepare {name}", key=f"prepare_{fmt}"):
+            return
+        job = export_job(fmt, query, start=True)
+    if job.state == "done":
+        st.download_button(label, job.result, name, mime=mime, on_click="ignore")
+    else:
+        _export_progress(fmt, query)
+
+def fmt_date(day):
+    d = day_to_date(day)
+    return "" if d is None else d.strftime("%Y-%m-%d")
 
 # ==================================================
 # STYLES (desktop + mobile)
@@ -83,121 +444,27 @@ st.markdown("""
   border-radius:10px;padding:1px 6px;display:inline-block;
 }
 .section {font-size:18px;font-weight:700;margin:18px 0 10px;}
+.grid {display:grid;column-gap:12px;}
 
 @media (max-width: 768px) {
   .stColumns { flex-direction: column !important; }
+  .grid { grid-template-columns: repeat(2, 1fr) !important; }
 }
 </style>
 """, unsafe_allow_html=True)
 
 # ==================================================
-# CARD - FIXED TIME FORMATTING
-# ==================================================
-def card(r):
-    s = pd.to_datetime(r["Start Date"])
-    is_today = s.date() == date.today()
-    cls = "card today" if is_today else "card"
-    
-    # Handle time display properly
-    if r["All Day"] == "True":
-        time_html = "All Day"
-    else:
-        # Use the stored time format directly
-        start_time = r["Start Time"] if pd.notna(r["Start Time"]) and r["Start Time"] != "" else "N/A"
-        end_time = r["End Time"] if pd.notna(r["End Time"]) and r["End Time"] != "" else "N/A"
-        time_html = f'{start_time} – {end_time}'
-
-    st.markdown(f"""
-    <div class="{cls}">
-        <div class="month">{s.strftime('%b').upper()}</div>
-        <div class="day">{s.strftime('%d')}</div>
-        <div class="time">{time_html}</div>
-        <div class="cat">{r["Category"]}</div>
-        <div class="program">{r["Program"]}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# ==================================================
-# PDF EXPORT
-# ==================================================
-def export_pdf(df):
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(buf)
-    styles = getSampleStyleSheet()
-    content = [Paragraph("<b>Admission Events</b><br/><br/>", styles["Title"])]
-
-    for _, r in df.iterrows():
-        txt = f"""
-        <b>{r['Program']}</b> – {r['Category']}<br/>
-        {r['Start Date']} to {r['End Date']}<br/><br/>
-        """
-        content.append(Paragraph(txt, styles["Normal"]))
-
-    doc.build(content)
-    buf.seek(0)
-    return buf
-
-# ==================================================
-# TIME FORMATTING FUNCTIONS
+# CARDS - one HTML grid block per section
 # ==================================================
-def format_12h(t):
-    """Convert datetime.time to 12-hour format"""
-    if pd.isna(t) or t == "":
-        return ""
-    if isinstance(t, str):
-        # If already a string, return as is
-        return t
-    
-    if isinstance(t, time):
-        hour = t.hour
-        minute = t.minute
-        suffix = "AM" if hour < 12 else "PM"
-        
-        if hour == 0:
-            hour = 12
-        elif hour > 12:
-            hour = hour - 12
-        
-        minute_str = f":{minute:02d}" if minute > 0 else ":00"
-        return f"{hour}{minute_str} {suffix}"
-    
-    return str(t)
-
-def parse_time_str(time_str):
-    """Parse time string to datetime.time object"""
-    if pd.isna(time_str) or time_str == "":
-        return None
-    
-    try:
-        # Handle 12-hour format
-        time_str = str(time_str).strip().upper()
-        if "AM" in time_str or "PM" in time_str:
-            time_part = time_str.replace("AM", "").replace("PM", "").strip()
-            if ":" in time_part:
-                hour_str, minute_str = time_part.split(":")
-                hour = int(hour_str)
-                minute = int(minute_str) if minute_str else 0
-            else:
-                hour = int(time_part)
-                minute = 0
-            
-            # Adjust for AM/PM
-            if "PM" in time_str and hour < 12:
-                hour += 12
-            elif "AM" in time_str and hour == 12:
-                hour = 0
-            
-            return time(hour, minute)
-        # Handle 24-hour format
-        elif ":" in time_str:
-            hour_str, minute_str = time_str.split(":")
-            hour = int(hour_str)
-            minute = int(minute_str) if minute_str else 0
-            return time(hour, minute)
-    except:
-        pass
-    
-    return None
+def render_sections(df, sections, kind, columns, stop):
+    """Emit the first stop rows of df as one block per month or week bucket
+    (contiguous slices of the start-sorted frame). Returns the number of
+    elements emitted."""
+    n = 0
+    for title, lo, hi in sections.slices(kind, stop):
+        st.markdown(section_html(title, df.iloc[lo:hi], columns), unsafe_allow_html=True)
+        n += 1
+    return n
 
 # ==================================================
 # ADMIN PAGE - FIXED TIME INPUTS
@@ -205,7 +472,11 @@ def parse_time_str(time_str):
 if st.session_state.page == "admin":
 
     st.header("🛠 Admin Panel")
-    df = load_events()
+    if st.session_state.overlap_notice:
+        st.warning(st.session_state.overlap_notice)
+        st.session_state.overlap_notice = None
+    version = data_version()
+    df = load_events(version)
 
     with st.form("add_event"):
         program = st.selectbox("Program", PROGRAMS)
@@ -217,63 +488,239 @@ if st.session_state.page == "admin":
         allday = st.checkbox("All Day")
         if not allday:
             t1, t2 = st.columns(2)
-            # Create proper time options (every 30 minutes)
-            time_options = [time(h, m) for h in range(24) for m in (0, 30)]
-            time_str_options = [format_12h(t) for t in time_options]
-            
-            # Default to 10:00 AM and 5:00 PM
-            default_start_idx = time_options.index(time(10, 0))
-            default_end_idx = time_options.index(time(17, 0))
-            
-            stime_str = t1.selectbox("Start Time", time_str_options, index=default_start_idx)
-            etime_str = t2.selectbox("End Time", time_str_options, index=default_end_idx)
-            
-            # Convert back to time objects
-            stime = time_options[time_str_options.index(stime_str)]
-            etime = time_options[time_str_options.index(etime_str)]
+            # Half-hour slots, default 10:00 AM to 5:00 PM
+            stime_str = t1.selectbox("Start Time", SLOT_LABELS, index=DEFAULT_START_SLOT)
+            etime_str = t2.selectbox("End Time", SLOT_LABELS, index=DEFAULT_END_SLOT)
+            stime = LABEL_TIME[stime_str]
+            etime = LABEL_TIME[etime_str]
         else:
             stime = etime = None
 
+        allow_overlap = st.checkbox("Save even if it overlaps")
         add = st.form_submit_button("Add Event")
 
     if add:
         new = {
-            "EventID": next_id(df),
             "Program": program,
             "Category": category,
-            "Start Date": sd.strftime("%Y-%m-%d"),
-            "End Date": ed.strftime("%Y-%m-%d"),
+            "Start Date": pd.Timestamp(sd),
+            "End Date": pd.Timestamp(ed),
             "Start Time": format_12h(stime) if not allday and stime else "",
             "End Time": format_12h(etime) if not allday and etime else "",
             "All Day": str(allday)
         }
-        df = pd.concat([df, pd.DataFrame([new])], ignore_index=True)
-        save_events(df)
-        st.success("Event added!")
-        st.rerun()
+        clashes = schedule_conflicts(new)
+        if len(clashes) and not allow_overlap:
+            show_conflicts(clashes)
+        else:
+            add_event(new)
+            st.success("Event added!")
+            st.rerun()
+
+    with st.expander("⚠️ Schedule overlaps"):
+        scope = st.radio("Compare events", ["category", "program", "global"], horizontal=True,
+                         format_func={"category": "Same category", "program": "Same program",
+                                      "global": "All events"}.get)
+        pairs = overlaps(scope)
+        if pairs.empty:
+            st.write("No overlapping events.")
+        else:
+            if len(pairs) == OVERLAP_LIMIT:
+                st.caption(f"First {OVERLAP_LIMIT} overlapping pairs by start date")
+            st.dataframe(pairs, hide_index=True)
+
+    with st.expander("📥 Bulk import / export"):
+        upload = st.file_uploader("CSV, XLSX or JSON with Program, Category, Start Date, End Date "
+                                  "and optionally Start Time, End Time, All Day columns",
+                                  type=list(FORMATS),
+                                  key=f"upload_{st.session_state.upload_round}")
+        if st.session_state.imported:
+            st.success(st.session_state.imported)
+            st.session_state.imported = None
+        if upload is not None:
+            try:
+                result = validate(read_table(upload, format_of(upload.name)))
+            except ValueError as e:
+                st.error(f"Cannot read {upload.name}: {e}")
+            else:
+                st.write(f"{len(result.valid)} valid rows, {result.rejected} rejected")
+                if not result.errors.empty:
+                    st.dataframe(result.errors, hide_index=True)
+                    st.download_button("Download error report", result.errors.to_csv(index=False),
+                                       "import_errors.csv", mime="text/csv")
+                if len(result.valid) and st.button(f"Import {len(result.valid)} events"):
+                    ids = import_events(result.valid)
+                    st.session_state.imported = f"Imported events {ids[0]}–{ids[-1]}"
+                    st.session_state.upload_round += 1
+                    st.rerun()
+
+        if not df.empty:
+            e1, e2 = st.columns(2)
+            with e1:
+                export_button("Export CSV", "csv", rows=len(df))
+            with e2:
+                export_button("Export JSON", "json", rows=len(df))
+
+    with st.expander("🗄️ Archive of past cycles"):
+        cutoff = default_cutoff()
+        st.caption("Archived events are read-only and only loaded when a view asks for past "
+                   "events. Restore a year to edit it.")
+        if st.button(f"Archive events that ended before {cutoff:%d %b %Y}"):
+            try:
+                n = archive_past_events(cutoff)
+            except StaleEventError:
+                st.warning("Events changed while archiving; run it again.")
+            else:
+                st.success(f"Archived {n} event(s)")
+                st.rerun()
+        manifest = _archive(DATA_FILE).manifest()
+        for year, part in sorted(manifest["years"].items()):
+            y1, y2 = st.columns([3, 1])
+            y1.write(f"**{year}**: {part['rows']} events")
+            if y2.button("Restore", key=f"restore_{year}"):
+                restore_archived(int(year))
+                st.rerun()
+
+    with st.expander("🔁 Recurring series & templates"):
+        st.caption("A series is stored once and shown for the dates a view asks for; its "
+                   "occurrences cannot be edited one by one.")
+        with st.form("add_series"):
+            r1, r2 = st.columns(2)
+            s_program = r1.selectbox("Program", PROGRAMS, key="series_program")
+            s_category = r2.selectbox("Category", CATEGORIES, key="series_category")
+            r3, r4, r5, r6 = st.columns(4)
+            s_first = r3.date_input("First day", key="series_first")
+            s_until = r4.date_input("Repeat until", value=s_first + timedelta(days=30),
+                                    key="series_until")
+            s_every = r5.number_input("Every (days)", 1, 366, 7, key="series_every")
+            s_length = r6.number_input("Lasts (days)", 1, 366, 1, key="series_length")
+            s_allday = st.checkbox("All Day", key="series_allday")
+            t1, t2 = st.columns(2)
+            s_stime = t1.selectbox("Start Time", SLOT_LABELS, index=DEFAULT_START_SLOT,
+                                   key="series_stime")
+            s_etime = t2.selectbox("End Time", SLOT_LABELS, index=DEFAULT_END_SLOT,
+                                   key="series_etime")
+            add_s = st.form_submit_button("Add series")
+        if add_s:
+            try:
+                add_series(Series(
+                    0, s_program, s_category, to_day(s_first), to_day(s_until),
+                    every=int(s_every), length=int(s_length) - 1,
+                    start_time=-1 if s_allday else LABEL_MINUTES[s_stime],
+                    end_time=-1 if s_allday else LABEL_MINUTES[s_etime],
+                    all_day=s_allday))
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success("Series added!")
+                st.rerun()
+        for s in _series(DATA_FILE, version[2]):
+            r1, r2 = st.columns([3, 1])
+            r1.write(f"**{s.program} · {s.category}**: every {s.every} day(s) from "
+                     f"{fmt_date(s.first_start)} to {fmt_date(s.until)} ({s.count} times)")
+            if r2.button("Remove", key=f"series_{s.series_id}"):
+                remove_series(s.series_id)
+                st.rerun()
+
+        st.markdown("**Cycle templates**")
+        m1, m2, m3, m4 = st.columns(4)
+        m_name = m1.text_input("Template name")
+        m_program = m2.selectbox("From program", PROGRAMS, key="template_from")
+        m_first = m3.date_input("Cycle from", key="template_first")
+        m_last = m4.date_input("Cycle to", value=m_first + timedelta(days=120), key="template_last")
+        if st.button("Save template") and m_name.strip():
+            cycle = df[(df["Program"] == m_program) & (df["Start Date"] >= to_day(m_first))
+                       & (df["Start Date"] <= to_day(m_last))]
+            try:
+                save_template(m_name.strip(), cycle)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"Saved {len(cycle)} steps as \"{m_name.strip()}\"")
+        templates = _series_store(DATA_FILE).templates()
+        if templates:
+            n1, n2, n3 = st.columns(3)
+            n_name = n1.selectbox("Template", sorted(templates))
+            n_program = n2.selectbox("For program", PROGRAMS, key="template_to")
+            n_start = n3.date_input("New cycle starts", key="template_start")
+            b1, b2 = st.columns([3, 1])
+            if b1.button(f"Add {len(templates[n_name])} events from template"):
+                ids = apply_template(n_name, n_program, n_start)
+                st.success(f"Added events {ids[0]}–{ids[-1]}")
+                st.rerun()
+            if b2.button("Remove template"):
+                remove_template(n_name)
+                st.rerun()
 
     st.subheader("📋 Events")
     if df.empty:
         st.info("No events yet. Add your first event above.")
     else:
-        for idx, r in df.iterrows():
-            with st.expander(f'{r["Program"]} – {r["Category"]} (ID: {r["EventID"]})'):
-                st.write(f"**Dates:** {r['Start Date']} to {r['End Date']}")
-                if r["All Day"] == "True":
-                    st.write("**Time:** All Day")
-                else:
-                    st.write(f"**Time:** {r['Start Time']} – {r['End Time']}")
-                
-                c1, c2 = st.columns(2)
-                if c1.button("✏️ Edit", key=f"edit_{idx}"):
-                    st.session_state.edit_idx = idx
-                    st.session_state.page = "edit"
-                    st.rerun()
-                if c2.button("❌ Delete", key=f"del_{idx}"):
-                    df = df.drop(idx).reset_index(drop=True)
-                    save_events(df)
-                    st.success("Event deleted!")
-                    st.rerun()
+        # Only the visible page is rendered; rows are addressed by EventID
+        a1, a2 = st.columns([3, 1])
+        admin_search = a1.text_input("Search events (EventID, program, category)")
+        positions = admin_positions(admin_search, version)
+        n_rows = len(df) if positions is None else len(positions)
+        n_pages = max(1, -(-n_rows // ADMIN_PAGE_SIZE))
+        st.session_state.admin_page = min(st.session_state.admin_page, n_pages)
+        page_no = a2.number_input(f"Page (of {n_pages})", 1, n_pages, key="admin_page")
+
+        lo = (page_no - 1) * ADMIN_PAGE_SIZE
+        if positions is None:
+            page_df = df.iloc[lo:lo + ADMIN_PAGE_SIZE]
+        else:
+            page_df = df.iloc[positions[lo:lo + ADMIN_PAGE_SIZE]]
+        grid = st.dataframe(
+            to_text_frame(page_df), hide_index=True, on_select="rerun",
+            selection_mode="multi-row", key=f"admin_grid_{page_no}_{admin_search}",
+        )
+        selected_rows = page_df.iloc[grid.selection.rows]
+        selected = selected_rows["EventID"].tolist()
+        versions = selected_rows["Version"].tolist()
+        st.caption(f"{n_rows} event(s) · {len(selected)} selected")
+
+        c1, c2 = st.columns(2)
+        if c1.button("✏️ Edit", disabled=len(selected) != 1):
+            st.session_state.edit_id = selected[0]
+            st.session_state.edit_version = versions[0]
+            st.session_state.page = "edit"
+            st.rerun()
+        if c2.button(f"❌ Delete selected ({len(selected)})", disabled=not selected):
+            try:
+                delete_events(selected, versions)
+            except StaleEventError as e:
+                st.error(f"Not deleted: {e}. The list has been reloaded.")
+            else:
+                st.success(f"Deleted {len(selected)} event(s)")
+                st.rerun()
+
+        if selected:
+            with st.form("bulk_edit"):
+                st.write(f"**Bulk edit {len(selected)} event(s)**")
+                b1, b2, b3 = st.columns(3)
+                keep = "(unchanged)"
+                bulk_program = b1.selectbox("Program", [keep] + PROGRAMS)
+                bulk_category = b2.selectbox("Category", [keep] + CATEGORIES)
+                bulk_allday = b3.selectbox("All Day", [keep, "True", "False"])
+                apply_bulk = st.form_submit_button("Apply to selected")
+            if apply_bulk:
+                changes = {}
+                if bulk_program != keep:
+                    changes["Program"] = bulk_program
+                if bulk_category != keep:
+                    changes["Category"] = bulk_category
+                if bulk_allday != keep:
+                    changes["All Day"] = bulk_allday
+                    if bulk_allday == "True":
+                        changes["Start Time"] = changes["End Time"] = ""
+                if changes:
+                    try:
+                        update_events(selected, changes, versions)
+                    except StaleEventError as e:
+                        st.error(f"Nothing updated: {e}. The list has been reloaded.")
+                    else:
+                        st.success(f"Updated {len(selected)} event(s)")
+                        st.rerun()
 
     st.divider()
     if st.button("⬅ Back to User View"):
@@ -285,78 +732,81 @@ if st.session_state.page == "admin":
 # ==================================================
 elif st.session_state.page == "edit":
 
-    df = load_events()
-    if df.empty:
-        st.error("No events to edit")
+    r = None if st.session_state.edit_id is None else event_by_id(st.session_state.edit_id)
+    if r is None:
+        st.error("This event no longer exists")
         st.session_state.page = "admin"
         st.rerun()
-    
-    r = df.iloc[st.session_state.edit_idx]
 
     st.header("✏️ Edit Event")
 
     # Parse existing times
-    existing_allday = r["All Day"] == "True"
+    existing_allday = bool(r["All Day"])
     
-    # Parse existing time strings to time objects if they exist
-    stime_existing = parse_time_str(r["Start Time"]) or time(10, 0)
-    etime_existing = parse_time_str(r["End Time"]) or time(17, 0)
+    # Existing times are minutes since midnight (negative when unset)
+    start_idx = nearest_slot(int(r["Start Time"]), DEFAULT_START_SLOT)
+    end_idx = nearest_slot(int(r["End Time"]), DEFAULT_END_SLOT)
 
     with st.form("edit_form"):
         program = st.selectbox("Program", PROGRAMS, index=PROGRAMS.index(r["Program"]))
         category = st.selectbox("Category", CATEGORIES, index=CATEGORIES.index(r["Category"]))
         c1, c2 = st.columns(2)
-        sd = c1.date_input("Start Date", pd.to_datetime(r["Start Date"]).date())
-        ed = c2.date_input("End Date", pd.to_datetime(r["End Date"]).date())
+        sd = c1.date_input("Start Date", day_to_date(r["Start Date"]))
+        ed = c2.date_input("End Date", day_to_date(r["End Date"]))
         allday = st.checkbox("All Day", value=existing_allday)
 
         if not allday:
-            # Create proper time options
-            time_options = [time(h, m) for h in range(24) for m in (0, 30)]
-            time_str_options = [format_12h(t) for t in time_options]
-            
-            # Find closest existing times in options
-            start_idx = 0
-            end_idx = 0
-            if stime_existing:
-                start_idx = min(range(len(time_options)), 
-                              key=lambda i: abs(time_options[i].hour * 60 + time_options[i].minute - 
-                                               (stime_existing.hour * 60 + stime_existing.minute)))
-            if etime_existing:
-                end_idx = min(range(len(time_options)), 
-                             key=lambda i: abs(time_options[i].hour * 60 + time_options[i].minute - 
-                                              (etime_existing.hour * 60 + etime_existing.minute)))
-            
+            # Preselect the slots closest to the existing times
             t1, t2 = st.columns(2)
-            stime_str = t1.selectbox("Start Time", time_str_options, index=start_idx)
-            etime_str = t2.selectbox("End Time", time_str_options, index=end_idx)
-            
-            # Convert back to time objects
-            stime = time_options[time_str_options.index(stime_str)]
-            etime = time_options[time_str_options.index(etime_str)]
+            stime_str = t1.selectbox("Start Time", SLOT_LABELS, index=start_idx)
+            etime_str = t2.selectbox("End Time", SLOT_LABELS, index=end_idx)
+            stime = LABEL_TIME[stime_str]
+            etime = LABEL_TIME[etime_str]
         else:
             stime = etime = None
 
+        allow_overlap = st.checkbox("Save even if it overlaps")
         update = st.form_submit_button("Update")
         cancel = st.form_submit_button("Cancel")
 
     if update:
-        df.at[st.session_state.edit_idx, "Program"] = program
-        df.at[st.session_state.edit_idx, "Category"] = category
-        df.at[st.session_state.edit_idx, "Start Date"] = sd.strftime("%Y-%m-%d")
-        df.at[st.session_state.edit_idx, "End Date"] = ed.strftime("%Y-%m-%d")
-        df.at[st.session_state.edit_idx, "Start Time"] = (
-            format_12h(stime) if not allday and stime else ""
-        )
-        df.at[st.session_state.edit_idx, "End Time"] = (
-            format_12h(etime) if not allday and etime else ""
-        )
-        df.at[st.session_state.edit_idx, "All Day"] = str(allday)
-    
-        save_events(df)
-        st.success("Event updated!")
-        st.session_state.page = "admin"
-        st.rerun()
+        changes = {
+            "Program": program,
+            "Category": category,
+            "Start Date": pd.Timestamp(sd),
+            "End Date": pd.Timestamp(ed),
+            "Start Time": format_12h(stime) if not allday and stime else "",
+            "End Time": format_12h(etime) if not allday and etime else "",
+            "All Day": str(allday),
+        }
+        # Only a changed schedule is blocked; overlaps the event already had
+        # (common across a season) are reported but do not stop other edits
+        moved = (category != r["Category"] or allday != existing_allday
+                 or to_day(sd) != r["Start Date"] or to_day(ed) != r["End Date"]
+                 or not allday and (stime_str, etime_str) != (SLOT_LABELS[start_idx],
+                                                             SLOT_LABELS[end_idx]))
+        clashes = schedule_conflicts({**changes, "EventID": r["EventID"]})
+        if len(clashes) and moved and not allow_overlap:
+            show_conflicts(clashes)
+        else:
+            # Rejected if another admin saved this event since it was opened
+            try:
+                update_event(r["EventID"], changes, st.session_state.edit_version)
+            except StaleEventError as e:
+                latest = event_by_id(r["EventID"])
+                if latest is None:
+                    st.error(f"Not saved: {e}.")
+                else:
+                    st.error(f"Not saved: {e}. The form now shows the latest values.")
+                    st.session_state.edit_version = int(latest["Version"])
+            else:
+                st.success("Event updated!")
+                if len(clashes):
+                    st.session_state.overlap_notice = (
+                        f"Event {r['EventID']} was saved; it overlaps {len(clashes)} "
+                        "event(s) of the same category.")
+                st.session_state.page = "admin"
+                st.rerun()
     
     if cancel:
         st.session_state.page = "admin"
@@ -379,39 +829,34 @@ else:
 
     st.header("📅 Upcoming Events")
 
-    df = load_events()
-    if df.empty:
+    prof = RerunProfile("user", enabled=st.session_state.profile)
+
+    with prof.phase("load") as ph:
+        version = data_version()
+        raw_df = load_events(version)
+        ph["rows"] = len(raw_df)
+    if raw_df.empty and not archived_count():
         st.info("No events available. Please add events in the Admin panel.")
         st.stop()
 
     # ---- Debug: Show raw data ----
     with st.expander("🔧 Debug: Show raw data"):
         st.write("Raw events data:")
-        st.dataframe(df)
-        st.write(f"Total events: {len(df)}")
-        if not df.empty:
-            st.write(f"Date range: {df['Start Date'].min()} to {df['End Date'].max()}")
+        st.dataframe(text_events(version=version))
+        st.write(f"Total events: {len(raw_df)}")
+        if not raw_df.empty:
+            st.write(f"Date range: {fmt_date(raw_df['Start Date'].min())} to {fmt_date(raw_df['End Date'].max())}")
 
     # ---- Clean and prepare data ----
-    # Convert date columns
-    try:
-        df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce").dt.normalize()
-        df["End Date"] = pd.to_datetime(df["End Date"], errors="coerce").dt.normalize()
-    except Exception as e:
-        st.error(f"Error parsing dates: {e}")
-        st.dataframe(df)
-        st.stop()
-    
-    # Remove rows with invalid dates
-    df = df[df["Start Date"].notna() & df["End Date"].notna()].copy()
+    # Valid dates only, sorted by Start Date (parsed and cached by the store layer)
+    with prof.phase("prepare") as ph:
+        df = prepared_events(version)
+        ph["rows"] = len(df)
     
-    if df.empty:
+    if df.empty and not archived_count():
         st.info("No valid events with proper dates.")
         st.stop()
 
-    # Sort by Start Date
-    df = df.sort_values("Start Date").reset_index(drop=True)
-
     # ---- Filters ----
     st.subheader("🔍 Filters")
     f1, f2, f3, f4 = st.columns(4)
@@ -425,34 +870,22 @@ else:
         dr = st.date_input("Date Range", [])
 
     # ---- Show all events toggle ----
-    show_all = st.checkbox("Show all events (including past events)", value=True)
+    # Off by default: only the live store is read; past cycles load on demand
+    show_all = st.checkbox("Show all events (including past events)", value=False)
 
-    # Apply date filtering if not showing all
-    filtered_df = df.copy()
-    
-    if not show_all:
-        today = pd.Timestamp.today().normalize()
-        # Show events that end today or in the future
-        filtered_df = filtered_df[filtered_df["End Date"] >= today].copy()
-    
-    # Apply other filters
-    if search:
-        filtered_df = filtered_df[
-            filtered_df["Program"].str.contains(search, case=False) |
-            filtered_df["Category"].str.contains(search, case=False)
-        ]
-    
-    if program != "All":
-        filtered_df = filtered_df[filtered_df["Program"] == program]
-    
-    if category != "All":
-        filtered_df = filtered_df[filtered_df["Category"] == category]
-    
-    if len(dr) == 2:
-        filtered_df = filtered_df[
-            (filtered_df["Start Date"].dt.date >= dr[0]) &
-            (filtered_df["End Date"].dt.date <= dr[1])
-        ]
+    # All filters are compiled into one query and resolved in a single pass;
+    # when not showing all, keep events that end today or in the future
+    query = EventQuery(
+        program=program if program != "All" else None,
+        category=category if category != "All" else None,
+        end_from=None if show_all else date.today(),
+        start_from=dr[0] if len(dr) == 2 else None,
+        end_until=dr[1] if len(dr) == 2 else None,
+        search=search,
+    )
+    with prof.phase("filter") as ph:
+        filtered_df = filtered_events(query, version)
+        ph["rows"] = len(filtered_df)
 
     # ---- View selection ----
     st.subheader("📊 View Options")
@@ -462,18 +895,17 @@ else:
     # ---- Debug: Show filtered data ----
     with st.expander("🔧 Debug: Show filtered data"):
         st.write(f"Filtered events: {len(filtered_df)}")
-        st.dataframe(filtered_df)
+        st.dataframe(text_events(query, version))
         if not filtered_df.empty:
-            st.write(f"Filtered date range: {filtered_df['Start Date'].min()} to {filtered_df['End Date'].max()}")
+            st.write(f"Filtered date range: {fmt_date(filtered_df['Start Date'].min())} to {fmt_date(filtered_df['End Date'].max())}")
 
     # ---- Export ----
     if not filtered_df.empty:
-        st.download_button(
-            "📄 Download PDF", 
-            export_pdf(filtered_df), 
-            "events.pdf",
-            help="Download all filtered events as PDF"
-        )
+        x1, x2 = st.columns(2)
+        with x1:
+            export_button("📄 Download PDF", "pdf", query, len(filtered_df))
+        with x2:
+            export_button("📅 Download ICS", "ics", query, len(filtered_df))
     else:
         st.info("No events match your filters")
 
@@ -485,131 +917,147 @@ else:
         
         # Show what might be wrong
         if not show_all and not df.empty:
-            today = pd.Timestamp.today().normalize()
-            future_events = df[df["End Date"] >= today]
-            st.write(f"You have {len(future_events)} future/ongoing events.")
+            status = event_stats().status()
+            st.write(f"You have {status['ongoing'] + status['upcoming']} future/ongoing events.")
             
-            past_events = df[df["End Date"] < today]
-            if len(past_events) > 0:
-                st.write(f"You have {len(past_events)} past events. Check 'Show all events' to see them.")
+            if status["past"] > 0:
+                st.write(f"You have {status['past']} past events. Check 'Show all events' to see them.")
     else:
         st.success(f"Showing {len(filtered_df)} event(s)")
         
-        if view == "Table":
-            # Simple table view for debugging
-            display_df = filtered_df.copy()
-            display_df["Start Date"] = display_df["Start Date"].dt.strftime("%Y-%m-%d")
-            display_df["End Date"] = display_df["End Date"].dt.strftime("%Y-%m-%d")
-            st.dataframe(display_df[["Program", "Category", "Start Date", "End Date", "Start Time", "End Time", "All Day"]])
-        
-        elif view == "Cards":
-            # Group by month
-            filtered_df["Month"] = filtered_df["Start Date"].dt.strftime("%B %Y")
-            
-            for month, month_group in filtered_df.groupby("Month", sort=False):
-                st.markdown(f"<div class='section'>{month}</div>", unsafe_allow_html=True)
-                
-                # Create columns for cards
-                cols = st.columns(6)
-                for idx, (_, event) in enumerate(month_group.iterrows()):
-                    with cols[idx % 6]:
-                        card(event)
-        
-        elif view == "Weekly":
-            # Group by week
-            filtered_df["Week"] = filtered_df["Start Date"].dt.strftime("Week %U, %Y")
-            
-            for week, week_group in filtered_df.groupby("Week", sort=False):
-                st.markdown(f"<div class='section'>{week}</div>", unsafe_allow_html=True)
-                
-                cols = st.columns(3)
-                for idx, (_, event) in enumerate(week_group.iterrows()):
-                    with cols[idx % 3]:
-                        card(event)
+        with prof.phase(f"render.{view.lower()}", rows=len(filtered_df)):
+            if view == "Table":
+                # Simple table view for debugging
+                display_df = to_text_frame(filtered_df)
+                st.dataframe(display_df[["Program", "Category", "Start Date", "End Date", "Start Time", "End Time", "All Day"]])
+                prof.count("elements")
         
-        elif view == "Monthly":
-            # Group by month-year
-            filtered_df["MonthYear"] = filtered_df["Start Date"].dt.strftime("%B %Y")
-            
-            for month_year, month_group in filtered_df.groupby("MonthYear", sort=False):
-                st.markdown(f"<div class='section'>{month_year}</div>", unsafe_allow_html=True)
-                
-                cols = st.columns(4)
-                for idx, (_, event) in enumerate(month_group.iterrows()):
-                    with cols[idx % 4]:
-                        card(event)
+            elif view in ("Cards", "Weekly", "Monthly"):
+                # Render a page at a time; start over when filters or view change
+                shown_for = (query, view)
+                if st.session_state.shown_for != shown_for:
+                    st.session_state.shown_for = shown_for
+                    st.session_state.show_limit = PAGE_SIZE
+                shown = min(st.session_state.show_limit, len(filtered_df))
+                kind, columns = {"Cards": ("month", 6), "Weekly": ("week", 3),
+                                 "Monthly": ("month", 4)}[view]
+                n = render_sections(filtered_df, sections(query, version), kind, columns, shown)
+                prof.count("elements", n)
+                prof.count("cards", shown)
+
+                if len(filtered_df) > shown:
+                    st.caption(f"Showing {shown} of {len(filtered_df)} events")
+                    if st.button("Load more"):
+                        st.session_state.show_limit += PAGE_SIZE
+                        st.rerun()
         
-        elif view == "Calendar":
-            st.subheader("📆 Calendar View")
-            
-            # Select month
-            selected_month = st.date_input("Select month to view", date.today())
+            elif view == "Calendar":
+                st.subheader("📆 Calendar View")
             
-            # Create calendar
-            month_start = selected_month.replace(day=1)
-            month_end = (month_start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+                # Select month
+                selected_month = st.date_input("Select month to view", date.today())
             
-            # Get first day of calendar (Sunday of the week containing month_start)
-            first_day = month_start - timedelta(days=month_start.weekday())
+                # Create calendar
+                month_start = selected_month.replace(day=1)
+                month_end = (month_start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
             
-            # Create calendar grid
-            st.markdown("### " + month_start.strftime("%B %Y"))
+                # Get first day of calendar (Sunday of the week containing month_start)
+                first_day = month_start - timedelta(days=(month_start.weekday() + 1) % 7)
             
-            # Day headers
-            day_names = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-            cols = st.columns(7)
-            for i, day_name in enumerate(day_names):
-                cols[i].markdown(f"**{day_name}**")
+                # Create calendar grid
+                st.markdown("### " + month_start.strftime("%B %Y"))
             
-            # Calendar days
-            current_day = first_day
-            for week in range(6):  # Max 6 weeks in calendar view
+                # Day headers
+                day_names = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
                 cols = st.columns(7)
-                for day_idx in range(7):
-                    with cols[day_idx]:
-                        # Check if day is in current month
-                        is_current_month = month_start.month == current_day.month
-                        day_style = ""
+                for i, day_name in enumerate(day_names):
+                    cols[i].markdown(f"**{day_name}**")
+            
+                # Calendar days; each cell is answered from the day index
+                index = day_index(query, version)
+                today = date.today()
+                current_day = first_day
+                for week in range(6):  # Max 6 weeks in calendar view
+                    cols = st.columns(7)
+                    for day_idx in range(7):
+                        with cols[day_idx]:
+                            # Check if day is in current month
+                            is_current_month = month_start.month == current_day.month
+                            day_style = ""
                         
-                        if current_day.date() == date.today():
-                            day_style = "border: 2px solid red; padding: 2px;"
+                            if current_day == today:
+                                day_style = "border: 2px solid red; padding: 2px;"
                         
-                        # Display day number
-                        day_text = f"<div style='{day_style}'>{current_day.day}</div>"
+                            # Display day number
+                            day_text = f"<div style='{day_style}'>{current_day.day}</div>"
                         
-                        # Get events for this day
-                        day_events = filtered_df[
-                            (filtered_df["Start Date"].dt.date <= current_day.date()) &
-                            (filtered_df["End Date"].dt.date >= current_day.date())
-                        ]
+                            # Get events for this day
+                            day_events = index.events_on(current_day)
                         
-                        if not day_events.empty:
-                            st.markdown(day_text, unsafe_allow_html=True)
-                            for _, event in day_events.iterrows():
-                                st.markdown(
-                                    f"<div class='program' title='{event['Category']}'>{event['Program']}</div>",
-                                    unsafe_allow_html=True
-                                )
-                        else:
-                            st.markdown(day_text, unsafe_allow_html=True)
-                            if is_current_month:
+                            # Day number and all of its events in one element
+                            chips = "".join(
+                                f"<div class='program' title='{escape(str(c))}'>{escape(str(p))}</div>"
+                                for p, c in zip(day_events["Program"], day_events["Category"])
+                            )
+                            st.markdown(day_text + chips, unsafe_allow_html=True)
+                            prof.count("elements")
+                            if day_events.empty and is_current_month:
                                 st.write("")  # Empty space for alignment
                     
-                    current_day += timedelta(days=1)
+                        current_day += timedelta(days=1)
                 
-                # Stop if we've passed the month end
-                if current_day.date() > month_end.date():
-                    break
+                    # Stop if we've passed the month end
+                    if current_day > month_end:
+                        break
 
     # ---- Statistics ----
     st.divider()
-    if not df.empty:
-        st.subheader("📈 Statistics")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Events", len(df))
-        with col2:
-            ongoing = len(df[df["End Date"] >= pd.Timestamp.today().normalize()])
-            st.metric("Upcoming/Ongoing", ongoing)
-        with col3:
-            st.metric("Programs", df["Program"].nunique())
+    if not df.empty or archived_count():
+        # Served from the aggregates kept current from the journal, not from df
+        with prof.phase("statistics"):
+            stats = event_stats()
+            status = stats.status()
+            st.subheader("📈 Statistics")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Events", stats.total)
+            with col2:
+                st.metric("Upcoming/Ongoing", status["ongoing"] + status["upcoming"])
+            with col3:
+                st.metric("Programs", len(stats.by_program))
+
+            with st.expander("📊 Breakdown"):
+                b1, b2 = st.columns(2)
+                with b1:
+                    st.write("**By category**")
+                    st.bar_chart(pd.Series({c: stats.by_category[c] for c in CATEGORIES}, name="Events"),
+                                 horizontal=True, sort=False)
+                with b2:
+                    st.write("**By status**")
+                    st.dataframe(pd.Series(status, name="Events"))
+                timeline_program = st.selectbox("Timeline", ["All programs"] + PROGRAMS,
+                                                key="timeline_program")
+                timeline = stats.timeline(None if timeline_program == "All programs" else timeline_program)
+                if timeline:
+                    st.bar_chart(pd.DataFrame(timeline, columns=["Month", "Events"]).set_index("Month"))
+                else:
+                    st.caption("No events for this program")
+
+    # ---- Debug: Rerun profile ----
+    rec = prof.finish()
+    if rec and METRICS_FILE:
+        write_prometheus(METRICS_FILE)
+    with st.expander("🔧 Debug: Rerun profile"):
+        st.checkbox("Profile reruns", key="profile")
+        if rec:
+            st.write(f"Total: {rec['total_ms']:.1f} ms")
+            st.dataframe(pd.DataFrame(rec["phases"], columns=["phase", "ms", "rows"]))
+            st.write("Emitted:", rec["counters"])
+            st.write("Background jobs:", _jobs().counts())
+            c1, c2 = st.columns(2)
+            c1.download_button("Profile (JSON)", json.dumps(rec, indent=2),
+                               "rerun_profile.json", mime="application/json")
+            c2.download_button("Metrics (Prometheus)", prometheus_text(),
+                               "events_metrics.prom", mime="text/plain")
+        else:
+            st.write("Profiling is off. Tick the box to time the next rerun.")
@@ -0,0 +1 @@
+"""Streamlit-free building blocks for the admission events app."""
@@ -0,0 +1,5 @@
+import sys
+
+from events_core.cli import main
+
+sys.exit(main())
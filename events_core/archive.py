@@ -0,0 +1,204 @@
+"""Cold tier: past admission cycles moved out of the live store.
+
+The live store (CSV or SQLite) is the hot tier and holds current and
+upcoming events; it is all the app loads by default. ``archive_events``
+moves events that ended before a cutoff (by default 1 January of the
+current year) into ``<store>.archive/``, one file per admission year (the
+year of the End Date). Partitions are NumPy ``.npz`` files of the typed
+columns, so loading one is a memory copy with no text parsing. The archive
+is read-only: ``restore_year`` puts a year back into the store, keeping
+the EventIDs.
+
+``manifest.json`` lists the partitions with their statistics counts (so
+the statistics block never opens a partition) and the archive ``horizon``,
+the day after the latest archived End Date. A query that keeps only events
+ending on or after the horizon cannot match anything archived, so the cold
+tier is loaded only for "show all" and historical date ranges
+(``needs_archive``).
+"""
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from events_core.schema import (
+    COLUMNS, MISSING_DAY, apply_schema, concat_typed, to_day, valid_dates,
+)
+from events_core.stats import EventStats, PastStats, counts_from_json, counts_to_json
+from events_core.storage import StaleEventError, atomic_write, file_lock, file_signature
+
+_STRING_COLUMNS = ("Program", "Category")
+
+
+def year_of(days):
+    """int32 days -> calendar year of each day"""
+    return np.asarray(days, dtype="datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+def default_cutoff(today=None):
+    """First day of the current admission year"""
+    return date((today or date.today()).year, 1, 1)
+
+
+class Archive:
+    """Year partitions of archived events next to a store file"""
+
+    def __init__(self, store_path):
+        self.dir = store_path + ".archive"
+        self._manifest_path = os.path.join(self.dir, "manifest.json")
+        self._lock_path = os.path.join(self.dir, ".lock")
+
+    def version(self):
+        """Changes whenever a partition is written or removed (None if empty)"""
+        return file_signature(self._manifest_path)
+
+    def manifest(self):
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"years": {}, "horizon": MISSING_DAY}
+
+    def years(self):
+        return sorted(int(y) for y in self.manifest()["years"])
+
+    @property
+    def horizon(self):
+        """Day after the latest archived End Date (MISSING_DAY when empty)"""
+        return self.manifest()["horizon"]
+
+    def __len__(self):
+        return sum(p["rows"] for p in self.manifest()["years"].values())
+
+    def stats(self):
+        """PastStats of every archived event, from the manifest alone"""
+        years = self.manifest()["years"].values()
+        counts = [EventStats().counts()] + [counts_from_json(p["counts"]) for p in years]
+        total = counts[0]
+        for c in counts[1:]:
+            total["total"] += c["total"]
+            for name in ("by_program", "by_category", "by_month", "by_program_month"):
+                total[name].update(c[name])
+        return PastStats(total)
+
+    def _path(self, year):
+        return os.path.join(self.dir, f"{int(year)}.npz")
+
+    def _read(self, year):
+        with np.load(self._path(year), allow_pickle=False) as z:
+            return apply_schema(pd.DataFrame({col: z[col] for col in COLUMNS}))
+
+    def load(self, years=None):
+        """Typed frame of the archived events (all years, or the given ones)"""
+        years = self.years() if years is None else years
+        frames = [self._read(y) for y in years]
+        if not frames:
+            return apply_schema(pd.DataFrame(columns=COLUMNS))
+        return concat_typed(frames)
+
+    def _write(self, year, df):
+        cols = {col: (df[col].astype(str).to_numpy(dtype=str) if col in _STRING_COLUMNS
+                      else df[col].to_numpy()) for col in COLUMNS}
+        atomic_write(self._path(year), lambda f: np.savez(f, **cols), binary=True)
+
+    def _save_manifest(self, years):
+        horizon = max((p["horizon"] for p in years.values()), default=MISSING_DAY)
+        atomic_write(self._manifest_path, lambda f: json.dump(
+            {"years": years, "horizon": horizon}, f, indent=1))
+
+    def _put(self, years, year, part):
+        """Write one partition and its manifest entry (lock held)"""
+        part = part.sort_values("EventID", kind="stable").reset_index(drop=True)
+        self._write(year, part)
+        years[str(year)] = {"rows": len(part),
+                            "horizon": int(part["End Date"].max()) + 1,
+                            "counts": counts_to_json(EventStats(part).counts())}
+
+    def add(self, df):
+        """Merge typed rows into their year partitions (same EventID replaced)"""
+        os.makedirs(self.dir, exist_ok=True)
+        with file_lock(self._lock_path):
+            years = self.manifest()["years"]
+            for year, part in df.groupby(year_of(df["End Date"]), sort=True):
+                if str(year) in years:
+                    old = self._read(year)
+                    part = concat_typed([old[~old["EventID"].isin(part["EventID"])], part])
+                self._put(years, year, part)
+            self._save_manifest(years)
+
+    def discard(self, df):
+        """Undo add(df): drop the EventIDs of df from their year partitions"""
+        with file_lock(self._lock_path):
+            years = self.manifest()["years"]
+            emptied = []
+            for year, part in df.groupby(year_of(df["End Date"]), sort=True):
+                if str(year) not in years:
+                    continue
+                old = self._read(year)
+                keep = old[~old["EventID"].isin(part["EventID"])]
+                if keep.empty:
+                    years.pop(str(year))
+                    emptied.append(year)
+                else:
+                    self._put(years, year, keep)
+            self._save_manifest(years)
+            for year in emptied:
+                os.unlink(self._path(year))
+
+    def remove(self, year):
+        """Drop one year partition"""
+        with file_lock(self._lock_path):
+            years = self.manifest()["years"]
+            if years.pop(str(int(year)), None) is None:
+                return
+            self._save_manifest(years)
+            os.unlink(self._path(year))
+
+
+def needs_archive(query, horizon):
+    """Whether an EventQuery can match archived events"""
+    if horizon == MISSING_DAY:
+        return False
+    return query.end_from is None or to_day(query.end_from) < horizon
+
+def with_archive(hot, cold):
+    """Hot and archived events in one frame; a hot row wins over an archived
+    copy of the same EventID (left behind by an interrupted archive run)"""
+    if not len(cold):
+        return hot
+    return concat_typed([cold[~cold["EventID"].isin(hot["EventID"])], hot])
+
+def archive_events(store, before=None):
+    """Move events with valid dates that ended before ``before`` into the archive.
+
+    Rows are written to the archive first and then deleted from the store at
+    the versions read. A concurrent edit raises StaleEventError: nothing is
+    deleted, the archived copies are discarded again and every event stays
+    hot. Returns the number of events archived.
+    """
+    # Archived events must all be past: never cut later than today
+    cutoff = min(to_day(before or default_cutoff()), to_day(date.today()))
+    df = store.load()
+    cold = df[valid_dates(df) & (df["End Date"] < cutoff)]
+    if cold.empty:
+        return 0
+    archive = Archive(store.path)
+    archive.add(cold)
+    try:
+        store.delete(cold["EventID"].tolist(), cold["Version"].tolist())
+    except StaleEventError:
+        archive.discard(cold)
+        raise
+    return len(cold)
+
+def restore_year(store, year):
+    """Put an archived year back into the store with its EventIDs, in one
+    locked write (a hot row with the same EventID is kept). Returns the
+    number of events restored."""
+    archive = Archive(store.path)
+    if year not in archive.years():
+        raise ValueError(f"{year} is not archived")
+    n = store.restore(archive.load([year]))
+    archive.remove(year)
+    return n
@@ -0,0 +1,60 @@
+"""Month and week sections of the Cards, Weekly and Monthly views.
+
+Bucket ids are integers computed from the int32 Start Date column in one
+vectorized pass: ``month_ids`` counts months since January 1970 and
+``week_ids`` is year * 100 + the Sunday-based week of the year (``%U``,
+the numbering the Weekly view shows). For a frame sorted by Start Date both
+are non-decreasing, so ``Sections`` keeps one offset table per kind (each
+distinct bucket with the row where it begins) and a view slices any prefix
+of the frame into contiguous ``(title, lo, hi)`` ranges. Titles are
+formatted once per bucket, never per row.
+"""
+from datetime import date
+
+import numpy as np
+
+
+def month_ids(days):
+    """int days -> months since January 1970"""
+    return np.asarray(days, dtype="datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+def week_ids(days):
+    """int days -> year * 100 + Sunday-based week of the year (as strftime %U)"""
+    days = np.asarray(days, dtype=np.int64)
+    years = days.astype("datetime64[D]").astype("datetime64[Y]")
+    year_day = days - years.astype("datetime64[D]").astype(np.int64)
+    weekday = (days + 4) % 7                        # 1970-01-01 was a Thursday; Sunday = 0
+    return (years.astype(np.int64) + 1970) * 100 + (year_day + 7 - weekday) // 7
+
+def bucket_title(kind, bucket):
+    if kind == "month":
+        return date(1970 + int(bucket) // 12, int(bucket) % 12 + 1, 1).strftime("%B %Y")
+    return f"Week {int(bucket) % 100:02d}, {int(bucket) // 100}"
+
+
+class Sections:
+    """Bucket offset tables of a frame sorted by Start Date"""
+
+    def __init__(self, df):
+        start = df["Start Date"].to_numpy(dtype=np.int64)
+        self._n = len(start)
+        self._tables = {"month": self._table(month_ids(start)),
+                        "week": self._table(week_ids(start))}
+
+    def _table(self, ids):
+        """(bucket ids, row offsets with the end appended)"""
+        if not len(ids):
+            return ids, np.zeros(1, dtype=np.intp)
+        begins = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        return ids[begins], np.r_[begins, len(ids)]
+
+    def __len__(self):
+        return self._n
+
+    def slices(self, kind, stop=None):
+        """(title, lo, hi) of each bucket of kind within the first stop rows"""
+        ids, offsets = self._tables[kind]
+        stop = self._n if stop is None else min(stop, self._n)
+        k = int(np.searchsorted(offsets, stop, side="left"))
+        return [(bucket_title(kind, ids[i]), int(offsets[i]), int(min(offsets[i + 1], stop)))
+                for i in range(min(k, len(ids)))]
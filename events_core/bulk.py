@@ -0,0 +1,186 @@
+"""Bulk import and export of events (CSV, XLSX, JSON).
+
+An import reads the whole file as text, validates every rule column-wise
+(known program and category, parseable dates with End >= Start, parseable
+times unless All Day, End Time after Start Time on one-day events) and hands
+the valid rows to ``EventStore.insert_many``, which assigns their EventIDs in
+one batch and writes them in one transaction. Rejected rows are listed in a
+row-level error report instead of stopping the import. Incoming EventIDs
+are ignored.
+
+    python -m events_core.bulk import events.csv season.xlsx [--dry-run] [--errors report.csv]
+    python -m events_core.bulk export events.csv events.json
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from events_core.schema import (
+    CATEGORIES, COLUMNS, MISSING_DAY, MISSING_MINUTE, PROGRAMS, apply_schema, to_days,
+    parse_times, to_text_frame,
+)
+from events_core.storage import open_store
+
+FORMATS = ("csv", "xlsx", "json")
+
+REQUIRED_COLUMNS = ["Program", "Category", "Start Date", "End Date"]
+
+_TRUE = {"true", "1", "yes"}
+_FALSE = {"false", "0", "no", ""}
+
+
+def format_of(name):
+    """'csv', 'xlsx' or 'json' from a file name"""
+    ext = os.path.splitext(str(name))[1].lower().lstrip(".")
+    fmt = "xlsx" if ext in ("xls", "xlsx") else ext
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported file type {ext!r} (use {', '.join(FORMATS)})")
+    return fmt
+
+def _excel_text(v):
+    if isinstance(v, time):
+        return v.strftime("%H:%M")
+    return "" if pd.isna(v) else str(v)
+
+def read_table(source, fmt):
+    """Path or file object -> frame of stripped strings ('' for blanks)"""
+    if fmt == "csv":
+        df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    elif fmt == "json":
+        df = pd.read_json(source, orient="records", dtype=False, convert_dates=False)
+        df = df.astype(object).where(df.notna(), "").astype(str)
+    elif fmt == "xlsx":
+        try:
+            df = pd.read_excel(source, dtype=object)
+        except ImportError as e:
+            raise ValueError("reading .xlsx files needs openpyxl (pip install openpyxl)") from e
+        df = df.map(_excel_text)
+    else:
+        raise ValueError(f"unsupported format {fmt!r}")
+    df.columns = [str(c).strip() for c in df.columns]
+    return df.apply(lambda col: col.str.strip())
+
+
+@dataclass
+class Validation:
+    valid: pd.DataFrame     # typed frame of the accepted rows
+    errors: pd.DataFrame    # Row, Column, Value, Error
+
+    @property
+    def rejected(self):
+        return self.errors["Row"].nunique()
+
+
+def validate(text):
+    """Check a text frame against the event rules, all rows at once.
+
+    Rows in the error report are numbered from 1 in file order.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in text.columns]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+    text = text.reindex(columns=COLUMNS, fill_value="").reset_index(drop=True)
+
+    start = to_days(text["Start Date"])
+    end = to_days(text["End Date"])
+    all_day_text = text["All Day"].str.lower()
+    all_day = all_day_text.isin(_TRUE).to_numpy()
+    start_min, bad_start_min = parse_times(text["Start Time"])
+    end_min, bad_end_min = parse_times(text["End Time"])
+    timed = ~all_day
+
+    checks = [
+        ("Program", ~text["Program"].isin(PROGRAMS).to_numpy(), "unknown program"),
+        ("Category", ~text["Category"].isin(CATEGORIES).to_numpy(), "unknown category"),
+        ("Start Date", start == MISSING_DAY, "missing or not a date"),
+        ("End Date", end == MISSING_DAY, "missing or not a date"),
+        ("End Date", (start != MISSING_DAY) & (end != MISSING_DAY) & (end < start),
+         "End Date before Start Date"),
+        ("All Day", ~(all_day | all_day_text.isin(_FALSE).to_numpy()), "expected True or False"),
+        ("Start Time", timed & bad_start_min, "not a time"),
+        ("End Time", timed & bad_end_min, "not a time"),
+        ("End Time", timed & (start == end) & (start_min != MISSING_MINUTE)
+         & (end_min != MISSING_MINUTE) & (end_min < start_min), "End Time before Start Time"),
+    ]
+    parts = []
+    bad = np.zeros(len(text), dtype=bool)
+    for col, mask, message in checks:
+        rows = np.flatnonzero(mask)
+        bad[rows] = True
+        parts.append(pd.DataFrame({"Row": rows + 1, "Column": col,
+                                   "Value": text[col].to_numpy()[rows], "Error": message}))
+    errors = pd.concat(parts, ignore_index=True).sort_values("Row", kind="stable")
+
+    ok = text[~bad].copy()
+    # All Day events carry no times
+    ok.loc[ok["All Day"].str.lower().isin(_TRUE), ["Start Time", "End Time"]] = ""
+    return Validation(apply_schema(ok).reset_index(drop=True), errors.reset_index(drop=True))
+
+def import_events(store, source, fmt, dry_run=False):
+    """Validate a file and insert its valid rows in one batch.
+
+    Returns (Validation, new EventIDs); nothing is written when dry_run.
+    """
+    result = validate(read_table(source, fmt))
+    if dry_run or result.valid.empty:
+        return result, []
+    return result, store.insert_many(result.valid)
+
+def export_events(df, target, fmt):
+    """Write a typed frame to a path or file object in the stored text form"""
+    out = to_text_frame(df)
+    if fmt == "csv":
+        out.to_csv(target, index=False)
+    elif fmt == "json":
+        out.to_json(target, orient="records", indent=1)
+    elif fmt == "xlsx":
+        try:
+            out.to_excel(target, index=False)
+        except ImportError as e:
+            raise ValueError("writing .xlsx files needs openpyxl (pip install openpyxl)") from e
+    else:
+        raise ValueError(f"unsupported format {fmt!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export of events")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="validate a file and add its events")
+    imp.add_argument("store", help="events.csv or a .db file")
+    imp.add_argument("file", help=".csv, .xlsx or .json")
+    imp.add_argument("--dry-run", action="store_true", help="validate only")
+    imp.add_argument("--errors", metavar="PATH", help="write the error report as CSV")
+    exp = sub.add_parser("export", help="write every event to a file")
+    exp.add_argument("store")
+    exp.add_argument("file", help=".csv, .xlsx or .json")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = format_of(args.file)
+        store = open_store(args.store)
+        if args.command == "export":
+            df = store.load()
+            export_events(df, args.file, fmt)
+            print(f"Exported {len(df)} events to {args.file}")
+            return 0
+        result, ids = import_events(store, args.file, fmt, dry_run=args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.errors:
+        result.errors.to_csv(args.errors, index=False)
+    for row in result.errors.head(20).itertuples(index=False):
+        print(f"row {row.Row}: {row.Column} {row.Value!r}: {row.Error}", file=sys.stderr)
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"{verb} {len(result.valid)} events, rejected {result.rejected} rows")
+    return 1 if len(result.errors) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
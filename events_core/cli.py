@@ -0,0 +1,152 @@
+"""Command line access to the events, without Streamlit.
+
+    python -m events_core list
+    python -m events_core filter --program KEAM --upcoming --search allot
+    python -m events_core export-pdf events.pdf --category "Final Allotment"
+    python -m events_core export-ics events.ics --upcoming
+    python -m events_core import season.xlsx [--dry-run] [--errors report.csv]
+    python -m events_core stats
+    python -m events_core archive [--before 2026-01-01]
+    python -m events_core restore 2025
+
+The store is ``--store`` (or $EVENTS_DATA_FILE, else events.csv), as for
+the app. Filters are the user page's, applied through the same
+``EventQuery`` pipeline; archived cycles are read when a command can match
+them, and recurring series are expanded for the filtered date window.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from events_core import bulk
+from events_core.archive import Archive, archive_events, needs_archive, restore_year, with_archive
+from events_core.ics import export_ics
+from events_core.query import EventQuery, PreparedEvents
+from events_core.schema import CATEGORIES, PROGRAMS, concat_typed, to_text_frame
+from events_core.search import SearchIndex
+from events_core.series import SeriesStore, series_events
+from events_core.stats import CombinedStats, EventStats
+from events_core.storage import open_store
+
+OUTPUT_FORMATS = ("table", "csv", "json")
+
+
+def _add_filters(parser):
+    parser.add_argument("--program", choices=PROGRAMS)
+    parser.add_argument("--category", choices=CATEGORIES)
+    parser.add_argument("--from", dest="start_from", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="Start Date on or after")
+    parser.add_argument("--until", dest="end_until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="End Date on or before")
+    parser.add_argument("--upcoming", action="store_true", help="hide events that have ended")
+    parser.add_argument("--search", default="", help="words in program or category")
+
+def _query(args):
+    return EventQuery(program=args.program, category=args.category,
+                      start_from=args.start_from, end_until=args.end_until,
+                      end_from=date.today() if args.upcoming else None, search=args.search)
+
+def load_events(store, query=None):
+    """Live events, plus the archived ones unless query excludes them. The
+    store filters of query are pushed down (indexed on SQLite)."""
+    df = store.load() if query is None else store.query(**query.store_filters())
+    archive = Archive(store.path)
+    if query is None or needs_archive(query, archive.horizon):
+        df = with_archive(df, archive.load())
+    return df
+
+def filtered(df, query, series=()):
+    """Valid events of df matching query, with the matching occurrences of
+    series, sorted by Start Date"""
+    prep = PreparedEvents(df)
+    index = SearchIndex(prep.df) if query.search.strip() else None
+    out = query.apply(prep, index)
+    occ = series_events(series, query)
+    if occ.empty:
+        return out
+    return concat_typed([out, occ]).sort_values("Start Date", kind="stable").reset_index(drop=True)
+
+def _print_events(df, fmt):
+    out = to_text_frame(df).drop(columns="Version")
+    if fmt == "csv":
+        out.to_csv(sys.stdout, index=False)
+    elif fmt == "json":
+        out.to_json(sys.stdout, orient="records", indent=1)
+        print()
+    else:
+        print(out.to_string(index=False) if len(out) else "No events.")
+
+def _stats(store):
+    stats = CombinedStats(EventStats(store.load()), Archive(store.path).stats())
+    status = stats.status()
+    print(f"Total events: {stats.total}")
+    print(f"Past: {status['past']}  Ongoing: {status['ongoing']}  Upcoming: {status['upcoming']}")
+    for title, counts in (("By program", stats.by_program), ("By category", stats.by_category)):
+        print(f"\n{title}:")
+        for name, n in counts.most_common():
+            print(f"  {name:<28}{n:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m events_core",
+                                     description="Admission events without the web app")
+    parser.add_argument("--store", default=os.environ.get("EVENTS_DATA_FILE", "events.csv"),
+                        help="events.csv or a .db file (default: $EVENTS_DATA_FILE or events.csv)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lst = sub.add_parser("list", help="print every event")
+    lst.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+    flt = sub.add_parser("filter", help="print the events matching the filters")
+    _add_filters(flt)
+    flt.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+    for name, what in (("export-pdf", "PDF"), ("export-ics", "iCalendar file")):
+        exp = sub.add_parser(name, help=f"write the matching events as a {what}")
+        exp.add_argument("file")
+        _add_filters(exp)
+    imp = sub.add_parser("import", help="validate a file and add its events")
+    imp.add_argument("file", help=".csv, .xlsx or .json")
+    imp.add_argument("--dry-run", action="store_true", help="validate only")
+    imp.add_argument("--errors", metavar="PATH", help="write the error report as CSV")
+    sub.add_parser("stats", help="print event counts")
+    arc = sub.add_parser("archive", help="move events of past cycles out of the live store")
+    arc.add_argument("--before", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                     help="End Date before this day (default: 1 January this year)")
+    res = sub.add_parser("restore", help="put an archived year back into the live store")
+    res.add_argument("year", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        cmd = ["import", args.store, args.file] + (["--dry-run"] if args.dry_run else [])
+        return bulk.main(cmd + (["--errors", args.errors] if args.errors else []))
+
+    try:
+        store = open_store(args.store)
+        if args.command == "list":
+            _print_events(load_events(store), args.format)
+        elif args.command == "filter":
+            query = _query(args)
+            _print_events(filtered(load_events(store, query), query,
+                                   SeriesStore(store.path).series()), args.format)
+        elif args.command == "stats":
+            _stats(store)
+        elif args.command == "archive":
+            print(f"Archived {archive_events(store, args.before)} events")
+        elif args.command == "restore":
+            print(f"Restored {restore_year(store, args.year)} events")
+        else:
+            query = _query(args)
+            events = filtered(load_events(store, query), query, SeriesStore(store.path).series())
+            if args.command == "export-pdf":
+                # ReportLab is slow to import; only PDF exports need it
+                from events_core.pdf import export_pdf
+                data = export_pdf(events)
+            else:
+                data = export_ics(events)
+            with open(args.file, "wb") as f:
+                f.write(data)
+            print(f"Exported {len(events)} events to {args.file}")
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,143 @@
+"""Schedule overlap detection.
+
+Every event is an interval in minutes since 1970-01-01: start day + start
+time to end day + end time, or whole days for All Day events and events with
+a blank time. Intervals are half-open, so an event ending at 10:00 does not
+overlap one starting at 10:00.
+
+``find_overlaps`` sorts the intervals by start and, for each one, binary
+searches the first later start at or past its end: everything in between
+overlaps it. That is O(n log n) plus the size of the answer, per program,
+per category or over all events. ``ConflictIndex`` keeps the sorted starts
+of a whole frame so a single candidate event is checked with two binary
+searches and a scan of the few intervals near it.
+"""
+import numpy as np
+import pandas as pd
+
+from events_core.schema import MISSING_DAY, text_to_minutes, to_day, to_bool, valid_dates
+
+DAY_MINUTES = 24 * 60
+
+# find_overlaps() scopes: which events are compared with each other
+SCOPES = {
+    "global": None,
+    "program": "Program",
+    "category": "Category",
+}
+
+
+def intervals(df):
+    """(start, end) int64 minute arrays for a typed frame with valid dates"""
+    all_day = df["All Day"].to_numpy(dtype=bool)
+    start_min = df["Start Time"].to_numpy(dtype=np.int64)
+    end_min = df["End Time"].to_numpy(dtype=np.int64)
+    start_min = np.where(all_day | (start_min < 0), 0, start_min)
+    end_min = np.where(all_day | (end_min < 0), DAY_MINUTES, end_min)
+    start = df["Start Date"].to_numpy(dtype=np.int64) * DAY_MINUTES + start_min
+    end = df["End Date"].to_numpy(dtype=np.int64) * DAY_MINUTES + end_min
+    # An end before the start (e.g. times entered the wrong way round) covers the start day
+    return start, np.maximum(end, start + 1)
+
+def event_interval(event):
+    """(start, end) minutes of one event mapping (typed or text), None without dates"""
+    start_day, end_day = to_day(event.get("Start Date")), to_day(event.get("End Date"))
+    if start_day == MISSING_DAY or end_day == MISSING_DAY:
+        return None
+
+    def minutes(v):
+        if isinstance(v, (int, np.integer)):
+            return int(v) if v >= 0 else None
+        return text_to_minutes(v)
+
+    all_day = bool(to_bool([event.get("All Day", False)])[0])
+    start_min = None if all_day else minutes(event.get("Start Time"))
+    end_min = None if all_day else minutes(event.get("End Time"))
+    start = start_day * DAY_MINUTES + (0 if start_min is None else start_min)
+    end = end_day * DAY_MINUTES + (DAY_MINUTES if end_min is None else end_min)
+    return start, max(end, start + 1)
+
+def _overlap_pairs(start, end, limit=None):
+    """(i, j) position pairs with i before j in start order and overlapping"""
+    order = np.argsort(start, kind="stable")
+    s, e = start[order], end[order]
+    # Later intervals overlapping interval k start before e[k]
+    hi = np.searchsorted(s, e, side="left")
+    counts = np.maximum(hi - np.arange(len(s)) - 1, 0)
+    if limit is not None:
+        # Pairs grow with the square of a busy period; stop listing at limit
+        before = np.cumsum(counts) - counts
+        counts = np.clip(limit - before, 0, counts)
+    first = np.repeat(np.arange(len(s)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    return order[first], order[second]
+
+def find_overlaps(df, scope="global", limit=None):
+    """Overlapping event pairs within the scope ("global", "program", "category").
+
+    Returns a frame with EventID/Program/Category of both events and the
+    overlap in minutes, sorted by the first event's start; at most ``limit``
+    pairs when given.
+    """
+    df = df[valid_dates(df)].reset_index(drop=True)
+    start, end = intervals(df)
+    key = SCOPES[scope]
+    if key is None:
+        groups = [np.arange(len(df))]
+    else:
+        groups = df.groupby(key, sort=False, observed=True).indices.values()
+
+    firsts, seconds = [], []
+    for pos in groups:
+        pos = np.asarray(pos, dtype=np.intp)
+        i, j = _overlap_pairs(start[pos], end[pos], limit)
+        firsts.append(pos[i])
+        seconds.append(pos[j])
+    i = np.concatenate(firsts) if firsts else np.empty(0, dtype=np.intp)
+    j = np.concatenate(seconds) if seconds else np.empty(0, dtype=np.intp)
+    order = np.lexsort((start[j], start[i]))[:limit]
+    i, j = i[order], j[order]
+
+    a, b = df.iloc[i].reset_index(drop=True), df.iloc[j].reset_index(drop=True)
+    return pd.DataFrame({
+        "EventID": a["EventID"], "Program": a["Program"], "Category": a["Category"],
+        "Other EventID": b["EventID"], "Other Program": b["Program"],
+        "Other Category": b["Category"],
+        "Overlap Minutes": np.minimum(end[i], end[j]) - np.maximum(start[i], start[j]),
+    })
+
+
+class ConflictIndex:
+    """Sorted intervals of a frame, for checking one candidate event at a time"""
+
+    def __init__(self, df):
+        df = df[valid_dates(df)]
+        start, end = intervals(df)
+        order = np.argsort(start, kind="stable")
+        self._start = start[order]
+        self._end = end[order]
+        self._max_span = int((end - start).max()) if len(start) else 0
+        self.df = df.iloc[order].reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.df)
+
+    def conflicts(self, event, same=("Category",)):
+        """Rows of indexed events overlapping ``event`` that share its ``same`` fields.
+
+        The candidate's own EventID (when editing) is never reported.
+        """
+        interval = event_interval(event)
+        if interval is None or not len(self.df):
+            return self.df.iloc[:0]
+        start, end = interval
+        lo = np.searchsorted(self._start, start - self._max_span, side="left")
+        hi = np.searchsorted(self._start, end, side="left")
+        keep = self._end[lo:hi] > start
+        rows = self.df.iloc[lo:hi][keep]
+        for field in same:
+            rows = rows[rows[field] == event.get(field)]
+        if event.get("EventID") is not None:
+            rows = rows[rows["EventID"] != int(event["EventID"])]
+        return rows
@@ -0,0 +1,70 @@
+"""Day -> events lookup for calendar style views.
+
+Events are kept sorted by start day together with the longest span in the
+set, so the events that can touch a day range are found with two binary
+searches (a sorted-endpoint sweep) instead of scanning the whole frame.
+Day buckets are filled one calendar month at a time, the first time a view
+asks for a day in that month, so any number of months can be browsed.
+Days are the int32 day numbers of the typed schema.
+"""
+import threading
+from datetime import date
+
+import numpy as np
+
+from events_core.schema import to_day
+
+
+def month_bounds(year, month):
+    """First and last day number of a calendar month"""
+    nxt = date(year + month // 12, month % 12 + 1, 1)
+    return to_day(date(year, month, 1)), to_day(nxt) - 1
+
+
+class DayIndex:
+    """Built once per filtered frame (valid Start/End Date required)"""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        start = self.df["Start Date"].to_numpy(dtype=np.int64)
+        end = self.df["End Date"].to_numpy(dtype=np.int64)
+        order = np.argsort(start, kind="stable")
+        self._start = start[order]
+        self._end = end[order]
+        self._pos = order
+        self._max_span = int((end - start).max()) if len(start) else 0
+        self._buckets = {}
+        self._months = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def _candidates(self, first, last):
+        """Sorted positions whose [start, end] overlaps [first, last]"""
+        lo = np.searchsorted(self._start, first - self._max_span, side="left")
+        hi = np.searchsorted(self._start, last, side="right")
+        keep = self._end[lo:hi] >= first
+        return self._start[lo:hi][keep], self._end[lo:hi][keep], self._pos[lo:hi][keep]
+
+    def _fill_month(self, year, month):
+        # Built aside and published whole: the index is shared by sessions
+        first, last = month_bounds(year, month)
+        starts, ends, positions = self._candidates(first, last)
+        buckets = {}
+        for s, e, p in zip(starts.tolist(), ends.tolist(), positions.tolist()):
+            for d in range(max(s, first), min(e, last) + 1):
+                buckets.setdefault(d, []).append(p)
+        with self._lock:
+            if (year, month) not in self._months:
+                self._buckets.update(buckets)
+                self._months.add((year, month))
+
+    def positions_on(self, day):
+        """Row positions (into ``self.df``) of the events running on ``day``"""
+        if (day.year, day.month) not in self._months:
+            self._fill_month(day.year, day.month)
+        return self._buckets.get(to_day(day), [])
+
+    def events_on(self, day):
+        return self.df.iloc[self.positions_on(day)]
@@ -0,0 +1,174 @@
+"""Read-only HTTP feed of the events, for students and partner sites.
+
+    python -m events_core.feed --store events.csv --port 8502
+
+    GET /events.json?program=KEAM&category=Final+Allotment
+    GET /events.ics?program=KEAM
+
+Bodies are built once per (data version, path, filters) and kept in memory
+with their gzip form and a strong ETag, so repeated polls cost a dictionary
+lookup: ``If-None-Match`` answers ``304 Not Modified``, clients sending
+``Accept-Encoding: gzip`` get the precompressed bytes. The data is kept
+current through ``LiveEvents``, checked at most every ``SYNC_SECONDS``.
+Only the live store is served; archived cycles (``events_core.archive``)
+are not part of the feed.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from events_core.ics import export_ics
+from events_core.query import EventQuery, PreparedEvents
+from events_core.schema import to_text_frame
+from events_core.storage import open_store
+from events_core.sync import LiveEvents
+
+SYNC_SECONDS = 1.0
+MAX_AGE = 60
+
+# Distinct filter combinations kept per data version (programs x categories
+# is well below this)
+MAX_BODIES = 256
+
+CONTENT_TYPES = {
+    "/events.json": "application/json",
+    "/events.ics": "text/calendar; charset=utf-8",
+}
+
+
+@dataclass(frozen=True)
+class Body:
+    data: bytes
+    gzipped: bytes
+    etag: str
+
+
+def _json(df):
+    out = to_text_frame(df).drop(columns="Version")
+    return json.dumps(out.to_dict("records"), separators=(",", ":")).encode()
+
+def _body(data):
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    return Body(data, gzip.compress(data, 6, mtime=0), f'"{digest}"')
+
+
+class FeedCache:
+    """Prepared response bodies for the current data version"""
+
+    def __init__(self, store):
+        self.live = LiveEvents(store)
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._token = None
+        self._prep = None
+        self._bodies = {}
+
+    def _current(self):
+        """PreparedEvents of the current data, syncing at most every SYNC_SECONDS"""
+        now = time.monotonic()
+        if now - self._checked >= SYNC_SECONDS:
+            self._checked = now
+            token = self.live.sync()
+            if token != self._token:
+                self._token, self._prep, self._bodies = token, None, {}
+        if self._prep is None:
+            self._prep = PreparedEvents(self.live.df)
+        return self._prep
+
+    def get(self, path, program=None, category=None):
+        """Body for a feed path and filters (None for an unknown path)"""
+        if path not in CONTENT_TYPES:
+            return None
+        key = (path, program, category)
+        with self._lock:
+            prep = self._current()
+            body = self._bodies.get(key)
+            if body is None:
+                df = EventQuery(program=program, category=category).apply(prep)
+                body = _body(_json(df) if path == "/events.json" else export_ics(df))
+                if len(self._bodies) >= MAX_BODIES:
+                    self._bodies.clear()
+                self._bodies[key] = body
+        return body
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    server_version = "EventsFeed/1.0"
+    cache = None    # FeedCache, set by make_server()
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def _respond(self, head):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        body = self.cache.get(url.path, params.get("program", [None])[0],
+                              params.get("category", [None])[0])
+        if body is None:
+            self.send_error(404, "Try /events.json or /events.ics")
+            return
+        gz = "gzip" in self.headers.get("Accept-Encoding", "")
+        # Each encoding is its own representation, with its own strong ETag
+        etag = body.etag[:-1] + '-gz"' if gz else body.etag
+        matches = self.headers.get("If-None-Match", "")
+        if matches.strip() == "*" or etag in (t.strip() for t in matches.split(",")):
+            self.send_response(304)
+            self._cache_headers(etag)
+            self.end_headers()
+            return
+        data = body.gzipped if gz else body.data
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[url.path])
+        self.send_header("Content-Length", str(len(data)))
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        self._cache_headers(etag)
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def _cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(store_path, host="", port=8502):
+    """ThreadingHTTPServer serving the feeds of a store"""
+    handler = type("Handler", (FeedHandler,), {"cache": FeedCache(open_store(store_path))})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON/ICS feed of the events")
+    parser.add_argument("--store", default=os.environ.get("EVENTS_DATA_FILE", "events.csv"),
+                        help="events.csv or a .db file (default: $EVENTS_DATA_FILE or events.csv)")
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+    server = make_server(args.store, args.host, args.port)
+    print(f"Serving /events.json and /events.ics on port {server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
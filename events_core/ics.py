@@ -0,0 +1,79 @@
+"""iCalendar (RFC 5545) export of an events frame.
+
+All Day events and events without times become date events (DTEND is the
+day after End Date, as the format wants it exclusive); timed events use
+floating local times, which calendar apps show in the viewer's own zone.
+Events without valid dates are skipped. UIDs are derived from the EventID,
+so re-importing an updated feed replaces events instead of duplicating them.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+from events_core.schema import valid_dates
+
+PRODID = "-//Admission Events//events_core//EN"
+UID_DOMAIN = "admission-events"
+
+
+def _escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+def _fold(line):
+    """Split a content line into 75-octet pieces joined by CRLF + space"""
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        # Never cut a UTF-8 sequence in half
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(raw[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+def _day_text(days):
+    return np.datetime_as_string(np.asarray(days, dtype="datetime64[D]"), unit="D")
+
+def ics_lines(df, stamp=None):
+    """Yield the content lines of a VCALENDAR holding every event of df"""
+    stamp = (stamp or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:{PRODID}"
+    yield "CALSCALE:GREGORIAN"
+    df = df[valid_dates(df)]
+    start_min = df["Start Time"].to_numpy(dtype=np.int64)
+    end_min = df["End Time"].to_numpy(dtype=np.int64)
+    dated = df["All Day"].to_numpy(dtype=bool) | (start_min < 0)
+    start_day = df["Start Date"].to_numpy(dtype=np.int64)
+    end_day = df["End Date"].to_numpy(dtype=np.int64)
+    starts = _day_text(start_day)
+    ends = _day_text(np.where(dated, end_day + 1, end_day))
+    rows = zip(df["EventID"].tolist(), df["Program"].astype(object).tolist(),
+               df["Category"].astype(object).tolist(), starts.tolist(), ends.tolist(),
+               dated.tolist(), start_min.tolist(), end_min.tolist())
+    for event_id, program, category, start, end, is_dated, smin, emin in rows:
+        yield "BEGIN:VEVENT"
+        yield f"UID:event-{event_id}@{UID_DOMAIN}"
+        yield f"DTSTAMP:{stamp}"
+        start, end = start.replace("-", ""), end.replace("-", "")
+        if is_dated:
+            yield f"DTSTART;VALUE=DATE:{start}"
+            yield f"DTEND;VALUE=DATE:{end}"
+        else:
+            # A blank end time runs to the end of the End Date
+            emin = 24 * 60 - 1 if emin < 0 else emin
+            yield f"DTSTART:{start}T{smin // 60:02d}{smin % 60:02d}00"
+            yield f"DTEND:{end}T{emin // 60:02d}{emin % 60:02d}00"
+        yield _fold(f"SUMMARY:{_escape(program)} – {_escape(category)}")
+        yield _fold(f"CATEGORIES:{_escape(program)},{_escape(category)}")
+        yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+def export_ics(df, stamp=None):
+    """iCalendar bytes for every event in df"""
+    return "".join(line + "\r\n" for line in ics_lines(df, stamp)).encode()
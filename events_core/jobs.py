@@ -0,0 +1,96 @@
+"""Background jobs for slow exports, shared by every session.
+
+A ``JobRunner`` owns a small thread pool and a registry of jobs by key.
+Submitting a key that is queued, running or finished returns the existing
+job, so two sessions asking for the same export of the same data version
+share one build and neither waits inside a rerun. Finished jobs are kept
+in an LRU of ``keep`` entries (jobs still queued or running are never
+dropped); a failed job is replaced by the next submit of its key.
+
+Job functions are called as ``fn(*args, progress=job.report)``, where
+``progress`` takes the fraction done, and run on pool threads: they must
+not call Streamlit.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("events.jobs")
+
+WORKERS = 2
+KEEP = 16
+
+
+class Job:
+    """State of one submitted job; ``result`` is set once ``state == "done"``"""
+
+    def __init__(self, key):
+        self.key = key
+        self.state = "queued"       # queued, running, done or failed
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def report(self, fraction):
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+
+
+class JobRunner:
+
+    def __init__(self, workers=WORKERS, keep=KEEP):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="events-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+
+    def submit(self, key, fn, *args):
+        """The job for key, starting fn(*args) unless it is already known"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.state != "failed":
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = Job(key)
+        self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, key):
+        """The job for key (None if never submitted or already evicted)"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._jobs.move_to_end(key)
+            return job
+
+    def counts(self):
+        """Number of known jobs per state"""
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {state: states.count(state) for state in ("queued", "running", "done", "failed")}
+
+    def _run(self, job, fn, args):
+        job.state = "running"
+        try:
+            job.result = fn(*args, progress=job.report)
+        except Exception as e:
+            logger.exception("job %r failed", job.key)
+            job.error = e
+            job.state = "failed"
+        else:
+            job.progress = 1.0
+            job.state = "done"
+        finally:
+            job._finished.set()
+            with self._lock:
+                self._trim()
+
+    def _trim(self):
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        for key in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[key]
@@ -0,0 +1,67 @@
+"""PDF export of an events frame.
+
+Paragraphs are produced from the frame a chunk of rows at a time and handed
+to ReportLab through a list that tops itself up as the build consumes it, so
+only about ``CHUNK_ROWS`` flowables are alive at once regardless of how many
+events are exported.
+"""
+import io
+from html import escape
+from itertools import islice
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+from events_core.schema import dates_text
+
+CHUNK_ROWS = 500
+
+
+class _FlowableFeed(list):
+    """Flowable list refilled from a generator whenever it runs low"""
+
+    def __init__(self, source, chunk=CHUNK_ROWS):
+        super().__init__()
+        self._source = iter(source)
+        self._chunk = chunk
+        self._refill()
+
+    def _refill(self):
+        if self._source is None:
+            return
+        batch = list(islice(self._source, self._chunk))
+        if len(batch) < self._chunk:
+            self._source = None
+        self.extend(batch)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        if len(self) < self._chunk // 2:
+            self._refill()
+
+
+def _paragraphs(df, styles, chunk=CHUNK_ROWS, progress=None):
+    yield Paragraph("<b>Admission Events</b><br/><br/>", styles["Title"])
+    for lo in range(0, len(df), chunk):
+        if progress is not None:
+            # Chunks are produced as the build consumes them
+            progress(lo / len(df))
+        part = df.iloc[lo:lo + chunk]
+        rows = zip(part["Program"].tolist(), part["Category"].tolist(),
+                   dates_text(part["Start Date"]).tolist(),
+                   dates_text(part["End Date"]).tolist())
+        for program, category, start, end in rows:
+            txt = f"""
+            <b>{escape(str(program))}</b> – {escape(str(category))}<br/>
+            {start} to {end}<br/><br/>
+            """
+            yield Paragraph(txt, styles["Normal"])
+
+def export_pdf(df, progress=None):
+    """PDF bytes listing every event in df; progress, if given, is called
+    with the fraction of rows laid out so far"""
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf)
+    styles = getSampleStyleSheet()
+    doc.build(_FlowableFeed(_paragraphs(df, styles, progress=progress)))
+    return buf.getvalue()
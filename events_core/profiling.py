@@ -0,0 +1,117 @@
+"""Per-rerun phase timings for the Streamlit page.
+
+A ``RerunProfile`` collects wall time and row counts per phase plus simple
+counters (e.g. Streamlit elements emitted) for one script run. Finished
+profiles are logged as one JSON line on the ``events.profile`` logger and
+folded into process-wide totals that ``prometheus_text()`` renders in the
+Prometheus text exposition format. A disabled profile costs one attribute
+check per phase.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("events.profile")
+
+_lock = threading.Lock()
+_phase_seconds = defaultdict(float)
+_phase_calls = defaultdict(int)
+_counters = defaultdict(int)
+_reruns = defaultdict(int)
+
+
+class RerunProfile:
+
+    def __init__(self, page, enabled=True):
+        self.page = page
+        self.enabled = enabled
+        self.phases = []
+        self.counters = defaultdict(int)
+        self._t0 = time.perf_counter()
+
+    def phase(self, name, rows=None):
+        """Context manager timing one phase; ``rows`` may be set on the yielded dict"""
+        if not self.enabled:
+            return nullcontext({})
+        return self._phase(name, rows)
+
+    @contextmanager
+    def _phase(self, name, rows):
+        rec = {"phase": name, "rows": rows}
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["ms"] = round((time.perf_counter() - t0) * 1000, 3)
+            self.phases.append(rec)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def total_ms(self):
+        return round((time.perf_counter() - self._t0) * 1000, 3)
+
+    def record(self):
+        return {
+            "page": self.page,
+            "total_ms": self.total_ms(),
+            "phases": self.phases,
+            "counters": dict(self.counters),
+        }
+
+    def finish(self):
+        """Log the profile and add it to the process totals"""
+        if not self.enabled:
+            return None
+        rec = self.record()
+        logger.info(json.dumps(rec))
+        with _lock:
+            _reruns[self.page] += 1
+            for p in self.phases:
+                _phase_seconds[p["phase"]] += p["ms"] / 1000
+                _phase_calls[p["phase"]] += 1
+            for name, n in self.counters.items():
+                _counters[name] += n
+        return rec
+
+
+def observe(phase, seconds):
+    """Add a timing measured outside a rerun (e.g. a deferred PDF build)"""
+    with _lock:
+        _phase_seconds[phase] += seconds
+        _phase_calls[phase] += 1
+
+def prometheus_text():
+    with _lock:
+        lines = [
+            "# HELP events_reruns_total Profiled script runs per page.",
+            "# TYPE events_reruns_total counter",
+        ]
+        lines += [f'events_reruns_total{{page="{k}"}} {v}' for k, v in sorted(_reruns.items())]
+        lines += [
+            "# HELP events_phase_seconds Wall time spent per rerun phase.",
+            "# TYPE events_phase_seconds summary",
+        ]
+        for name in sorted(_phase_calls):
+            lines.append(f'events_phase_seconds_sum{{phase="{name}"}} {_phase_seconds[name]:.6f}')
+            lines.append(f'events_phase_seconds_count{{phase="{name}"}} {_phase_calls[name]}')
+        lines += [
+            "# HELP events_emitted_total Items emitted by the page (elements, rows, ...).",
+            "# TYPE events_emitted_total counter",
+        ]
+        lines += [f'events_emitted_total{{item="{k}"}} {v}' for k, v in sorted(_counters.items())]
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path):
+    """Atomically replace path with the current metrics (textfile collector)"""
+    text = prometheus_text()
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
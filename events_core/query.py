@@ -0,0 +1,104 @@
+"""Compiled filter pipeline for the user page.
+
+``PreparedEvents`` is built once per data version: the valid, start-sorted
+frame plus lookup structures (program/category -> row positions, EventID ->
+row position, the sorted start dates). An ``EventQuery`` holds every active
+filter and resolves them to one array of row positions using those lookups
+first, and a single vectorized pass over the remaining candidates for the
+end-date bounds. The frame is then sliced once with ``take``; an empty query
+returns the prepared frame itself.
+"""
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from events_core.schema import to_day, valid_dates
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+def _positions_by(col):
+    """value -> sorted row positions"""
+    return {k: np.asarray(v, dtype=np.intp) for k, v in col.groupby(col, sort=False, observed=True).indices.items()}
+
+
+class PreparedEvents:
+    """Valid events sorted by Start Date, with lookup structures"""
+
+    def __init__(self, df):
+        df = df[valid_dates(df)]
+        self.df = df.sort_values("Start Date", kind="stable").reset_index(drop=True)
+        self.start = self.df["Start Date"].to_numpy()
+        self.end = self.df["End Date"].to_numpy()
+        self.by_program = _positions_by(self.df["Program"])
+        self.by_category = _positions_by(self.df["Category"])
+        self.position_of = dict(zip(self.df["EventID"].tolist(), range(len(self.df))))
+
+    def __len__(self):
+        return len(self.df)
+
+    def positions_of(self, event_ids):
+        """Sorted row positions of the given EventIDs (unknown ids ignored)"""
+        get = self.position_of.get
+        pos = np.fromiter((p for p in map(get, event_ids) if p is not None), dtype=np.intp)
+        return np.sort(pos)
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Every user-page filter; None/"" means not filtered. Hashable."""
+
+    program: str = None
+    category: str = None
+    start_from: object = None   # Start Date >= start_from
+    end_until: object = None    # End Date <= end_until
+    end_from: object = None     # End Date >= end_from (hides past events)
+    search: str = ""
+
+    def is_empty(self):
+        return not self.search.strip() and all(
+            getattr(self, f.name) is None for f in fields(self) if f.name != "search"
+        )
+
+    def store_filters(self):
+        """Filters accepted by EventStore.query() (pushdown, no search)"""
+        return {k: getattr(self, k)
+                for k in ("program", "category", "start_from", "end_until", "end_from")
+                if getattr(self, k) is not None}
+
+    def positions(self, prep, search_index=None):
+        """Sorted row positions of prep.df matching every filter"""
+        n = len(prep)
+        lo = 0
+        if self.start_from is not None and n:
+            lo = int(np.searchsorted(prep.start, to_day(self.start_from), "left"))
+
+        cand = None
+        for lookup, value in ((prep.by_program, self.program), (prep.by_category, self.category)):
+            if value is not None:
+                p = lookup.get(value, _EMPTY)
+                cand = p if cand is None else np.intersect1d(cand, p, assume_unique=True)
+        if self.search.strip():
+            if search_index is None:
+                raise ValueError("a search query needs a SearchIndex")
+            p = prep.positions_of(search_index.scores(self.search))
+            cand = p if cand is None else np.intersect1d(cand, p, assume_unique=True)
+
+        if cand is None:
+            cand = np.arange(lo, n, dtype=np.intp)
+        elif lo:
+            cand = cand[cand >= lo]
+
+        keep = None
+        if self.end_until is not None and n:
+            keep = prep.end[cand] <= to_day(self.end_until)
+        if self.end_from is not None and n:
+            m = prep.end[cand] >= to_day(self.end_from)
+            keep = m if keep is None else keep & m
+        return cand if keep is None else cand[keep]
+
+    def apply(self, prep, search_index=None):
+        """Matching rows of prep.df, sliced once"""
+        if self.is_empty():
+            return prep.df
+        return prep.df.take(self.positions(prep, search_index))
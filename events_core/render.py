@@ -0,0 +1,91 @@
+"""HTML for the Cards/Weekly/Monthly views.
+
+A whole section (one month or week) is emitted as a single CSS grid block
+instead of one Streamlit element per event. Card fragments are memoized by
+(EventID, row version, is-today), where the row version is a hash of the
+row's displayed fields, so an edited event is re-rendered and nothing else is.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+from html import escape
+
+from events_core.schema import days_to_datetime, minutes_to_text, to_day
+
+CARD_FIELDS = ["Program", "Category", "Start Date", "End Date",
+               "Start Time", "End Time", "All Day"]
+
+MAX_CACHED_CARDS = 20000
+
+_cards = OrderedDict()
+_lock = threading.Lock()
+
+
+def row_versions(df):
+    """Content hash of the displayed fields, one per row"""
+    cols = [df[c].tolist() for c in CARD_FIELDS]
+    return [hash(row) for row in zip(*cols)]
+
+def _time_html(all_day, start_minutes, end_minutes):
+    if all_day:
+        return "All Day"
+    start_time = minutes_to_text(start_minutes) or "N/A"
+    end_time = minutes_to_text(end_minutes) or "N/A"
+    return f"{escape(start_time)} – {escape(end_time)}"
+
+def _card(month, day, is_today, time_html, category, program):
+    cls = "card today" if is_today else "card"
+    return (
+        f'<div class="{cls}">'
+        f'<div class="month">{month}</div>'
+        f'<div class="day">{day}</div>'
+        f'<div class="time">{time_html}</div>'
+        f'<div class="cat">{escape(str(category))}</div>'
+        f'<div class="program">{escape(str(program))}</div>'
+        f'</div>'
+    )
+
+def card_fragments(df, today=None):
+    """HTML card per row of df, in order"""
+    if df.empty:
+        return []
+    today = to_day(today or date.today())
+    starts = df["Start Date"]
+    keys = list(zip(df["EventID"].tolist(), row_versions(df),
+                    (starts == today).tolist()))
+
+    out = []
+    with _lock:
+        for k in keys:
+            frag = _cards.get(k)
+            if frag is not None:
+                _cards.move_to_end(k)
+            out.append(frag)
+    missing = [i for i, frag in enumerate(out) if frag is None]
+    if not missing:
+        return out
+
+    sub = df.iloc[missing]
+    starts = days_to_datetime(sub["Start Date"])
+    months = starts.dt.strftime("%b").str.upper().tolist()
+    days = starts.dt.strftime("%d").tolist()
+    rows = zip(missing, months, days, sub["All Day"].tolist(),
+               sub["Start Time"].tolist(), sub["End Time"].tolist(),
+               sub["Category"].tolist(), sub["Program"].tolist())
+    with _lock:
+        for i, month, day, all_day, stime, etime, category, program in rows:
+            frag = _card(month, day, keys[i][2], _time_html(all_day, stime, etime),
+                         category, program)
+            out[i] = _cards[keys[i]] = frag
+        while len(_cards) > MAX_CACHED_CARDS:
+            _cards.popitem(last=False)
+    return out
+
+def grid_html(df, columns, today=None):
+    """All cards of df as one grid block"""
+    cards = "".join(card_fragments(df, today))
+    return (f'<div class="grid" style="grid-template-columns:repeat({columns},1fr)">'
+            f'{cards}</div>')
+
+def section_html(title, df, columns, today=None):
+    return f"<div class='section'>{escape(str(title))}</div>" + grid_html(df, columns, today)
@@ -0,0 +1,255 @@
+"""Programs, categories, the column layout and the typed in-memory schema.
+
+Events are stored as text (ISO dates, "10:00 AM" times, "True"/"False").
+In memory they are held as:
+
+    Program, Category      category (known values first, unknown ones appended)
+    Start Date, End Date   int32 days since 1970-01-01 (MISSING_DAY if unparseable)
+    Start Time, End Time   int16 minutes since midnight (MISSING_MINUTE if blank)
+    All Day                bool
+    Version                int32 row version, bumped by every update (1 if absent)
+
+apply_schema() converts the text form once at ingest and to_text_frame()
+converts back for storage and display.
+"""
+from datetime import date, time
+
+import numpy as np
+import pandas as pd
+
+PROGRAMS = [
+    "KEAM", "LLB 3 Year", "LLB 5 Year", "LLM",
+    "PG Ayurveda", "PG Homoeo", "PG Nursing"
+]
+
+CATEGORIES = [
+    "Online Application",
+    "Memo Clearance",
+    "Option Registration",
+    "Provisional Category List",
+    "Provisional Rank List",
+    "Provisional Allotment",
+    "Final Allotment"
+]
+
+COLUMNS = [
+    "EventID", "Program", "Category",
+    "Start Date", "End Date",
+    "Start Time", "End Time", "All Day", "Version"
+]
+
+DATE_COLUMNS = ("Start Date", "End Date")
+TIME_COLUMNS = ("Start Time", "End Time")
+
+MISSING_DAY = np.iinfo(np.int32).min
+MISSING_MINUTE = -1
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_day(value):
+    """Date-like scalar -> days since epoch (MISSING_DAY when missing/invalid)"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, date) and not pd.isna(value):
+        return value.toordinal() - _EPOCH_ORDINAL
+    ts = pd.to_datetime(value, errors="coerce")
+    if pd.isna(ts):
+        return MISSING_DAY
+    return int((ts.to_datetime64().astype("datetime64[D]") - _EPOCH).astype(np.int64))
+
+def to_days(values):
+    """Vectorized to_day(); integer input is taken as days already"""
+    values = pd.Series(values)
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype=np.int32)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dt = values.to_numpy(dtype="datetime64[D]")
+        days = (dt - _EPOCH).astype(np.int64)
+        days[np.isnat(dt)] = MISSING_DAY
+        return days.astype(np.int32)
+    # Text: many rows share a date, so parse each distinct value once
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    table = np.append(to_days(pd.to_datetime(pd.Series(uniques), errors="coerce")), MISSING_DAY)
+    return table[codes].astype(np.int32)
+
+def day_to_date(day):
+    return None if day == MISSING_DAY else (_EPOCH + np.timedelta64(int(day), "D")).item()
+
+def days_to_datetime(days):
+    """int32 days -> datetime64 Series (NaT for MISSING_DAY), for .dt formatting"""
+    days = np.asarray(days, dtype=np.int64)
+    dt = (_EPOCH + days.astype("timedelta64[D]")).astype("datetime64[s]")
+    dt[days == MISSING_DAY] = np.datetime64("NaT")
+    return pd.Series(dt)
+
+def _is_digits(s):
+    return s.isascii() and s.isdigit()
+
+def text_to_minutes(text):
+    """'10:30 AM', '2 PM' or '14:30' -> minutes since midnight, None if unparseable"""
+    if text is None or pd.isna(text):
+        return None
+    s = str(text).strip().upper()
+    if s in _LABEL_MINUTE:
+        return _LABEL_MINUTE[s]
+    if not s:
+        return None
+    suffix = None
+    if s.endswith(("AM", "PM")):
+        suffix, s = s[-2:], s[:-2].strip()
+    hour_str, _, minute_str = s.partition(":")
+    # ASCII digits only, like the vectorized parser's [0-9]
+    if not _is_digits(hour_str) or (minute_str and not _is_digits(minute_str)):
+        return None
+    hour, minute = int(hour_str), int(minute_str or 0)
+    if suffix == "PM" and hour < 12:
+        hour += 12
+    elif suffix == "AM" and hour == 12:
+        hour = 0
+    if suffix is None and not minute_str:
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+def minutes_to_text(minutes):
+    """Minutes since midnight -> '10:00 AM' ('' when missing)"""
+    if minutes is None or minutes < 0:
+        return ""
+    h, m = divmod(int(minutes), 60)
+    return f"{(h + 11) % 12 + 1}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+def format_12h(t):
+    """datetime.time -> '10:00 AM'; strings pass through, blanks give ''"""
+    if t is None or (not isinstance(t, time) and pd.isna(t)) or t == "":
+        return ""
+    if isinstance(t, str):
+        return t
+    if isinstance(t, time):
+        return minutes_to_text(t.hour * 60 + t.minute)
+    return str(t)
+
+def parse_time_str(time_str):
+    """'10:30 AM' / '14:30' -> datetime.time, None if blank or unparseable"""
+    minutes = text_to_minutes(time_str)
+    return None if minutes is None else time(*divmod(minutes, 60))
+
+# Canonical labels ('10:00 AM') for every minute of the day; the last entry
+# is what times_text() shows for a missing time
+_TIME_LABELS = np.array([minutes_to_text(m) for m in range(24 * 60)] + [""], dtype=object)
+_LABEL_MINUTE = {label.upper(): m for m, label in enumerate(_TIME_LABELS[:-1])}
+
+_TIME_RE = r"^([0-9]+)(:[0-9]*)?\s*(AM|PM)?$"
+
+def _parse_rest(text):
+    """Non-label time strings (stripped, upper-cased) -> float minutes, NaN if invalid"""
+    parts = text.str.extract(_TIME_RE)
+    hour = pd.to_numeric(parts[0])
+    minute = pd.to_numeric(parts[1].str[1:].replace("", "0"))
+    suffix = parts[2]
+    hour = hour.mask((suffix == "PM") & (hour < 12), hour + 12)
+    hour = hour.mask((suffix == "AM") & (hour == 12), 0)
+    # '14:30' and '2 PM' are times, a bare '14' is not
+    ok = (hour <= 23) & (minute.fillna(0) <= 59) & (
+        suffix.notna() | (minute.notna() & (parts[1] != ":")))
+    return (hour * 60 + minute.fillna(0)).where(ok).to_numpy()
+
+def parse_times(values):
+    """Vectorized text_to_minutes() with per-row errors.
+
+    Returns (int16 minutes, bool invalid): blanks are MISSING_MINUTE and
+    valid; text that is not a time is MISSING_MINUTE and invalid. Each
+    distinct string is parsed once: canonical labels by dictionary lookup,
+    everything else in one regex pass.
+    """
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    text = [str(u).strip().upper() for u in uniques]
+    table = np.full(len(text) + 1, MISSING_MINUTE, dtype=np.int16)
+    bad = np.zeros(len(text) + 1, dtype=bool)
+    rest = []
+    for i, t in enumerate(text):
+        m = _LABEL_MINUTE.get(t)
+        if m is not None:
+            table[i] = m
+        elif t:
+            rest.append(i)
+    if rest:
+        minutes = _parse_rest(pd.Series([text[i] for i in rest], dtype=object))
+        ok = ~np.isnan(minutes)
+        table[np.asarray(rest)[ok]] = minutes[ok]
+        bad[np.asarray(rest)[~ok]] = True
+    return table[codes], bad[codes]
+
+def to_minutes(values):
+    """Vectorized text_to_minutes() -> int16 array (MISSING_MINUTE when blank)"""
+    values = pd.Series(values)
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype=np.int16)
+    return parse_times(values)[0]
+
+def to_bool(values):
+    values = pd.Series(values)
+    if pd.api.types.is_bool_dtype(values):
+        return values.to_numpy()
+    return values.astype(str).str.strip().str.lower().isin(["true", "1", "yes"]).to_numpy()
+
+def _categorical(values, known):
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    uniques = [str(u) for u in uniques]
+    categories = list(known) + sorted(set(uniques) - set(known))
+    position = {c: i for i, c in enumerate(categories)}
+    table = np.array([position[u] for u in uniques] + [-1], dtype=np.int64)
+    return pd.Categorical.from_codes(table[codes], categories=categories)
+
+def apply_schema(df):
+    """Stored/text frame -> canonical typed frame (new object, COLUMNS order)"""
+    df = df.reindex(columns=COLUMNS)
+    return pd.DataFrame({
+        "EventID": pd.to_numeric(df["EventID"], errors="coerce").fillna(0).to_numpy(dtype=np.int64),
+        "Program": _categorical(df["Program"], PROGRAMS),
+        "Category": _categorical(df["Category"], CATEGORIES),
+        "Start Date": to_days(df["Start Date"]),
+        "End Date": to_days(df["End Date"]),
+        "Start Time": to_minutes(df["Start Time"]),
+        "End Time": to_minutes(df["End Time"]),
+        "All Day": to_bool(df["All Day"]),
+        "Version": pd.to_numeric(df["Version"], errors="coerce").fillna(1).to_numpy(dtype=np.int32),
+    })
+
+def concat_typed(frames):
+    """Concatenate typed frames, keeping Program/Category categorical"""
+    frames = [f for f in frames if len(f)] or frames[:1]
+    out = pd.concat(frames, ignore_index=True)
+    for col, known in (("Program", PROGRAMS), ("Category", CATEGORIES)):
+        if not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = _categorical(out[col], known)
+    return out
+
+def valid_dates(df):
+    """Boolean mask of rows with both dates set"""
+    return (df["Start Date"] != MISSING_DAY) & (df["End Date"] != MISSING_DAY)
+
+def dates_text(days):
+    """int32 days -> 'YYYY-MM-DD' strings ('' when missing)"""
+    return days_to_datetime(days).dt.strftime("%Y-%m-%d").fillna("").to_numpy(dtype=object)
+
+def times_text(minutes):
+    """int16 minutes -> '10:00 AM' strings ('' when missing)"""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    return _TIME_LABELS[np.where(minutes < 0, 24 * 60, minutes)]
+
+def to_text_frame(df):
+    """Typed frame -> the stored text form (also what tables display)"""
+    return pd.DataFrame({
+        "EventID": df["EventID"].to_numpy(),
+        "Program": df["Program"].astype(object).fillna("").to_numpy(),
+        "Category": df["Category"].astype(object).fillna("").to_numpy(),
+        "Start Date": dates_text(df["Start Date"]),
+        "End Date": dates_text(df["End Date"]),
+        "Start Time": times_text(df["Start Time"]),
+        "End Time": times_text(df["End Time"]),
+        "All Day": np.where(df["All Day"].to_numpy(dtype=bool), "True", "False"),
+        "Version": df["Version"].to_numpy(),
+    }, index=df.index)
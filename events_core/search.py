@@ -0,0 +1,150 @@
+"""Token + trigram search index over the text fields of the events.
+
+Built once, then kept current with ``add`` / ``remove`` as events change.
+Query terms are matched case-insensitively against the indexed tokens: exact
+token, token prefix (binary search over the sorted vocabulary) or, for terms
+of three or more characters, any substring found through the trigram index.
+Every term must match somewhere in the event; results are ranked by how well
+the terms matched.
+"""
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+# Indexed when present in the frame
+SEARCH_FIELDS = ("Program", "Category", "Title", "Description")
+
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text).lower())
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Built from a frame, then kept current with add()/remove()"""
+
+    def __init__(self, df, fields=SEARCH_FIELDS):
+        self.fields = [f for f in fields if f in df.columns]
+        self._lock = threading.RLock()
+        self._ids = set()
+        self._postings = {}
+        self._vocab = []
+        self._grams = defaultdict(set)
+        self.add(df)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _token_ids(self, df):
+        """token -> EventIDs of the rows of df containing it"""
+        # Index distinct field values, not rows: a few dozen strings cover
+        # thousands of events
+        postings = defaultdict(set)
+        for field in self.fields:
+            for value, group in df.groupby(field, sort=False, observed=True)["EventID"]:
+                event_ids = group.tolist()
+                for token in set(tokenize(value)):
+                    postings[token].update(event_ids)
+        return postings
+
+    def add(self, df):
+        """Index the rows of df (EventIDs not in the index yet)"""
+        postings = self._token_ids(df)
+        with self._lock:
+            self._ids.update(df["EventID"].tolist())
+            for token, event_ids in postings.items():
+                if token not in self._postings:
+                    self._postings[token] = set()
+                    insort(self._vocab, token)
+                    for g in trigrams(token):
+                        self._grams[g].add(token)
+                self._postings[token] |= event_ids
+
+    def remove(self, df):
+        """Drop the rows of df, given with the values they were indexed with"""
+        postings = self._token_ids(df)
+        with self._lock:
+            self._ids.difference_update(df["EventID"].tolist())
+            for token, event_ids in postings.items():
+                left = self._postings.get(token)
+                if left is None:
+                    continue
+                left -= event_ids
+                if not left:
+                    del self._postings[token]
+                    del self._vocab[bisect_left(self._vocab, token)]
+                    for g in trigrams(token):
+                        self._grams[g].discard(token)
+
+    def _matching_tokens(self, term):
+        """Vocabulary tokens matching one query term -> match score"""
+        out = {}
+        i = bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            token = self._vocab[i]
+            out[token] = EXACT if token == term else PREFIX
+            i += 1
+        if len(term) >= 3:
+            sets = sorted((self._grams.get(g, set()) for g in trigrams(term)), key=len)
+            for token in set.intersection(*sets) if sets[0] else ():
+                if token not in out and term in token:
+                    out[token] = SUBSTRING
+        return out
+
+    def scores(self, query):
+        """EventID -> score for events matching every term of ``query``"""
+        terms = tokenize(query)
+        if not terms:
+            return {}
+        with self._lock:
+            return self._scores(terms)
+
+    def _scores(self, terms):
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token, score in self._matching_tokens(term).items():
+                for event_id in self._postings[token]:
+                    if term_scores.get(event_id, 0) < score:
+                        term_scores[event_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {e: scores[e] + s for e, s in term_scores.items() if e in scores}
+            if not scores:
+                break
+        return scores
+
+    def search(self, query, limit=None):
+        """Matching EventIDs, best match first (ties by EventID, so an index
+        kept current with add()/remove() ranks like a freshly built one)"""
+        scores = self.scores(query)
+        ranked = sorted(scores, key=lambda e: (-scores[e], e))
+        return ranked[:limit] if limit else ranked
+
+
+class CombinedIndex:
+    """Several indexes over disjoint events (e.g. live and archived) as one"""
+
+    def __init__(self, *parts):
+        self.parts = parts
+
+    def scores(self, query):
+        out = {}
+        for part in self.parts:
+            out.update(part.scores(query))
+        return out
+
+    def search(self, query, limit=None):
+        """Matching EventIDs, best match first (ties: earlier index, then EventID)"""
+        ranked = [(-score, i, event_id) for i, part in enumerate(self.parts)
+                  for event_id, score in part.scores(query).items()]
+        ids = [event_id for _, _, event_id in sorted(ranked)]
+        return ids[:limit] if limit else ids
@@ -0,0 +1,213 @@
+"""Recurring event series and cycle templates, stored as definitions.
+
+A ``Series`` is one row however many times it repeats: the first
+occurrence (start day, length in days, times) repeated every ``every`` days
+up to ``until``. Occurrences are never stored; ``occurrences`` generates
+the ones overlapping a day window by arithmetic, so the cost grows with
+what a view shows, not with how long the series runs. ``series_events``
+expands the series an ``EventQuery`` can match, for the query's own date
+window, into a typed frame that is filtered like stored events. Occurrence
+EventIDs are negative (``occurrence_id``), so they never collide with
+stored events and cannot be edited as such.
+
+A template is an admission cycle's Program x Category sequence as offsets
+from its first Start Date. ``make_template`` takes it from events already
+entered, and ``instantiate`` produces the next cycle's events from a new
+start date for ``EventStore.insert_many``.
+
+Series and templates of a store live in ``<store>.series.json``.
+"""
+import json
+from dataclasses import asdict, dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from events_core.query import PreparedEvents
+from events_core.schema import (
+    COLUMNS, MISSING_DAY, MISSING_MINUTE, apply_schema, day_to_date, to_day,
+)
+from events_core.search import SearchIndex
+from events_core.storage import atomic_write, file_lock, file_signature
+
+# Occurrence n of series s has EventID -(s * OCCURRENCE_IDS + n)
+OCCURRENCE_IDS = 1_000_000
+
+
+@dataclass(frozen=True)
+class Series:
+    series_id: int
+    program: str
+    category: str
+    first_start: int            # day number of the first occurrence
+    until: int                  # no occurrence starts after this day
+    every: int = 7              # days between occurrence starts
+    length: int = 0             # End Date - Start Date of each occurrence
+    start_time: int = MISSING_MINUTE
+    end_time: int = MISSING_MINUTE
+    all_day: bool = False
+
+    def __post_init__(self):
+        if self.every < 1:
+            raise ValueError("a series repeats every 1 or more days")
+        if self.length < 0:
+            raise ValueError("an occurrence cannot end before it starts")
+        if self.until < self.first_start:
+            raise ValueError("the series ends before its first occurrence")
+
+    @property
+    def count(self):
+        return (self.until - self.first_start) // self.every + 1
+
+    def to_json(self):
+        d = asdict(self)
+        d["first_start"] = day_to_date(self.first_start).isoformat()
+        d["until"] = day_to_date(self.until).isoformat()
+        return d
+
+    @classmethod
+    def from_json(cls, d):
+        return cls(**{**d, "first_start": to_day(d["first_start"]), "until": to_day(d["until"])})
+
+
+def occurrence_id(series_id, n):
+    return -(series_id * OCCURRENCE_IDS + n)
+
+def occurrences(series, first=None, last=None):
+    """Yield (n, start day, end day) of the occurrences overlapping [first, last]"""
+    n = 0
+    if first is not None:
+        # First occurrence still running on day `first`
+        n = max(0, -(-(first - series.length - series.first_start) // series.every))
+    stop = series.until if last is None else min(series.until, last)
+    start = series.first_start + n * series.every
+    while start <= stop:
+        yield n, start, start + series.length
+        n += 1
+        start += series.every
+
+def expand(series_list, first=None, last=None):
+    """Typed frame of the occurrences of every series overlapping [first, last]"""
+    cols = {c: [] for c in COLUMNS}
+    for s in series_list:
+        rows = list(occurrences(s, first, last))
+        if not rows:
+            continue
+        n, start, end = (np.array(v, dtype=np.int64) for v in zip(*rows))
+        cols["EventID"].append(occurrence_id(s.series_id, n))
+        cols["Start Date"].append(start)
+        cols["End Date"].append(end)
+        for col, value in (("Program", s.program), ("Category", s.category),
+                           ("Start Time", s.start_time), ("End Time", s.end_time),
+                           ("All Day", s.all_day), ("Version", 1)):
+            cols[col].append(np.full(len(rows), value, dtype=object if isinstance(value, str) else None))
+    if not cols["EventID"]:
+        return apply_schema(pd.DataFrame(columns=COLUMNS).astype({"EventID": np.int64}))
+    return apply_schema(pd.DataFrame({c: np.concatenate(v) for c, v in cols.items()}))
+
+def query_window(query):
+    """(first, last) days an EventQuery can show (None = unbounded)"""
+    bounds = [to_day(v) for v in (query.start_from, query.end_from) if v is not None]
+    first = max(bounds) if bounds else None
+    last = None if query.end_until is None else to_day(query.end_until)
+    return first, last
+
+def series_events(series_list, query):
+    """Occurrences matching an EventQuery, sorted by Start Date; only the
+    series of the query's program/category are expanded, only for its window"""
+    series_list = [s for s in series_list
+                   if query.program in (None, s.program) and query.category in (None, s.category)]
+    first, last = query_window(query)
+    occ = expand(series_list, first, last)
+    if occ.empty:
+        return occ
+    prep = PreparedEvents(occ)
+    return query.apply(prep, SearchIndex(prep.df) if query.search.strip() else None)
+
+
+# ==================================================
+# TEMPLATES
+# ==================================================
+def make_template(df):
+    """Steps of a cycle from its typed events: offsets from the first Start Date"""
+    df = df[df["Start Date"] != MISSING_DAY].sort_values("Start Date", kind="stable")
+    if df.empty:
+        raise ValueError("a template needs at least one event with dates")
+    base = int(df["Start Date"].iloc[0])
+    return [{"Category": str(r["Category"]), "offset": int(r["Start Date"]) - base,
+             "length": max(int(r["End Date"]) - int(r["Start Date"]), 0),
+             "Start Time": int(r["Start Time"]), "End Time": int(r["End Time"]),
+             "All Day": bool(r["All Day"])}
+            for r in df.to_dict("records")]
+
+def instantiate(steps, program, start):
+    """Typed events (EventIDs unset) of a template starting on ``start``"""
+    base = to_day(start)
+    return apply_schema(pd.DataFrame({
+        "EventID": 0,
+        "Program": program,
+        "Category": [s["Category"] for s in steps],
+        "Start Date": [base + s["offset"] for s in steps],
+        "End Date": [base + s["offset"] + s["length"] for s in steps],
+        "Start Time": [s["Start Time"] for s in steps],
+        "End Time": [s["End Time"] for s in steps],
+        "All Day": [s["All Day"] for s in steps],
+        "Version": 1,
+    }))
+
+
+# ==================================================
+# STORAGE
+# ==================================================
+class SeriesStore:
+    """``<store>.series.json``: series definitions and named templates"""
+
+    def __init__(self, store_path):
+        self.path = store_path + ".series.json"
+        self._lock_path = store_path + ".series.lock"
+
+    def version(self):
+        return file_signature(self.path)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"last_id": 0, "series": [], "templates": {}}
+
+    def _write(self, data):
+        atomic_write(self.path, lambda f: json.dump(data, f, indent=1))
+
+    def series(self):
+        return [Series.from_json(d) for d in self._read()["series"]]
+
+    def templates(self):
+        return self._read()["templates"]
+
+    def add(self, series):
+        """Store a series (its series_id is assigned here); returns the id"""
+        with file_lock(self._lock_path):
+            data = self._read()
+            data["last_id"] += 1
+            data["series"].append(replace(series, series_id=data["last_id"]).to_json())
+            self._write(data)
+        return data["last_id"]
+
+    def remove(self, series_id):
+        with file_lock(self._lock_path):
+            data = self._read()
+            data["series"] = [d for d in data["series"] if d["series_id"] != int(series_id)]
+            self._write(data)
+
+    def save_template(self, name, steps):
+        with file_lock(self._lock_path):
+            data = self._read()
+            data["templates"][name] = steps
+            self._write(data)
+
+    def remove_template(self, name):
+        with file_lock(self._lock_path):
+            data = self._read()
+            data["templates"].pop(name, None)
+            self._write(data)
@@ -0,0 +1,195 @@
+"""Materialized statistics over the events.
+
+``EventStats`` holds counts by program, category, start month and
+program x month, plus the sorted start and end days, for every event with
+valid dates. It is built once from a frame and then kept current from the
+change journal by ``LiveEvents`` (``add`` / ``remove`` per event), so the
+statistics block never scans the event table. Counts are O(1) lookups; the
+past/ongoing/upcoming split depends on the day asked about and costs two
+binary searches. ``PastStats`` holds the same counts for archived events
+(all past, so no day lists) and ``CombinedStats`` adds several up.
+"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+from events_core.schema import MISSING_DAY, to_day, valid_dates
+
+
+def month_of(day):
+    """Day number -> month number (months since 1970-01)"""
+    return int(np.datetime64(int(day), "D").astype("datetime64[M]").astype(np.int64))
+
+def month_label(month):
+    """Month number -> 'YYYY-MM'"""
+    return str(np.datetime64(int(month), "M"))
+
+
+class EventStats:
+
+    def __init__(self, df=None):
+        self._lock = threading.Lock()
+        self.by_program = Counter()
+        self.by_category = Counter()
+        self.by_month = Counter()
+        self.by_program_month = Counter()
+        self._starts = []
+        self._ends = []
+        if df is not None:
+            self._add_frame(df)
+
+    def _add_frame(self, df):
+        df = df[valid_dates(df)]
+        starts = df["Start Date"].to_numpy(dtype=np.int64)
+        months = starts.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        programs = df["Program"].astype(object).tolist()
+        self.by_program.update(programs)
+        self.by_category.update(df["Category"].astype(object).tolist())
+        self.by_month.update(months.tolist())
+        self.by_program_month.update(zip(programs, months.tolist()))
+        self._starts = np.sort(starts).tolist()
+        self._ends = np.sort(df["End Date"].to_numpy(dtype=np.int64)).tolist()
+
+    @property
+    def total(self):
+        return len(self._starts)
+
+    # ---- incremental maintenance ----
+    @staticmethod
+    def _key(event):
+        start, end = to_day(event.get("Start Date")), to_day(event.get("End Date"))
+        if start == MISSING_DAY or end == MISSING_DAY:
+            return None
+        return event.get("Program"), event.get("Category"), start, end
+
+    def add(self, event):
+        """Count one event mapping (typed or text values)"""
+        key = self._key(event)
+        if key is None:
+            return
+        program, category, start, end = key
+        month = month_of(start)
+        with self._lock:
+            self.by_program[program] += 1
+            self.by_category[category] += 1
+            self.by_month[month] += 1
+            self.by_program_month[program, month] += 1
+            insort(self._starts, start)
+            insort(self._ends, end)
+
+    def remove(self, event):
+        """Undo add(event); the mapping must hold the values that were counted"""
+        key = self._key(event)
+        if key is None:
+            return
+        program, category, start, end = key
+        month = month_of(start)
+        with self._lock:
+            for counter, k in ((self.by_program, program), (self.by_category, category),
+                               (self.by_month, month),
+                               (self.by_program_month, (program, month))):
+                counter[k] -= 1
+                if counter[k] <= 0:
+                    del counter[k]
+            del self._starts[bisect_left(self._starts, start)]
+            del self._ends[bisect_left(self._ends, end)]
+
+    # ---- queries ----
+    def status(self, today=None):
+        """{"past", "ongoing", "upcoming"} counts relative to today"""
+        day = to_day(today or date.today())
+        with self._lock:
+            past = bisect_left(self._ends, day)
+            upcoming = len(self._starts) - bisect_right(self._starts, day)
+            total = len(self._starts)
+        return {"past": past, "ongoing": total - past - upcoming, "upcoming": upcoming}
+
+    def timeline(self, program=None):
+        """[(month label, count)] in month order, for one program or all"""
+        with self._lock:
+            by_month, by_program_month = Counter(self.by_month), Counter(self.by_program_month)
+        return _timeline(by_month, by_program_month, program)
+
+    def counts(self):
+        """Copies of the counters and the total, taken together"""
+        with self._lock:
+            return {"total": len(self._starts), "by_program": Counter(self.by_program),
+                    "by_category": Counter(self.by_category), "by_month": Counter(self.by_month),
+                    "by_program_month": Counter(self.by_program_month)}
+
+
+
+def _timeline(by_month, by_program_month, program):
+    if program is None:
+        items = by_month.items()
+    else:
+        items = [(m, n) for (p, m), n in by_program_month.items() if p == program]
+    return [(month_label(m), n) for m, n in sorted(items)]
+
+def counts_to_json(counts):
+    """EventStats.counts() -> JSON-compatible dict"""
+    return {
+        "total": counts["total"],
+        "by_program": dict(counts["by_program"]),
+        "by_category": dict(counts["by_category"]),
+        "by_month": {str(m): n for m, n in counts["by_month"].items()},
+        "by_program_month": [[p, m, n] for (p, m), n in counts["by_program_month"].items()],
+    }
+
+def counts_from_json(data):
+    return {
+        "total": data["total"],
+        "by_program": Counter(data["by_program"]),
+        "by_category": Counter(data["by_category"]),
+        "by_month": Counter({int(m): n for m, n in data["by_month"].items()}),
+        "by_program_month": Counter({(p, m): n for p, m, n in data["by_program_month"]}),
+    }
+
+
+class PastStats:
+    """Counts of events that have all ended (archived cycles), without the
+    per-event day lists: every one of them is past"""
+
+    def __init__(self, counts):
+        self._counts = counts
+        self.total = counts["total"]
+        self.by_program = counts["by_program"]
+        self.by_category = counts["by_category"]
+        self.by_month = counts["by_month"]
+        self.by_program_month = counts["by_program_month"]
+
+    def counts(self):
+        return self._counts
+
+    def status(self, today=None):
+        return {"past": self.total, "ongoing": 0, "upcoming": 0}
+
+    def timeline(self, program=None):
+        return _timeline(self.by_month, self.by_program_month, program)
+
+
+class CombinedStats:
+    """Read-only sum of several stats (e.g. the live and the archived events)"""
+
+    def __init__(self, *parts):
+        self.parts = parts
+        self.total = 0
+        self.by_program, self.by_category = Counter(), Counter()
+        self.by_month, self.by_program_month = Counter(), Counter()
+        for part in parts:
+            counts = part.counts()
+            self.total += counts["total"]
+            for name in ("by_program", "by_category", "by_month", "by_program_month"):
+                getattr(self, name).update(counts[name])
+
+    def status(self, today=None):
+        out = Counter()
+        for part in self.parts:
+            out.update(part.status(today))
+        return {k: out[k] for k in ("past", "ongoing", "upcoming")}
+
+    def timeline(self, program=None):
+        return _timeline(self.by_month, self.by_program_month, program)
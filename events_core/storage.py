@@ -0,0 +1,808 @@
+"""Event storage backends.
+
+``CsvStore`` keeps the original events.csv layout. ``SqliteStore`` keeps one
+row per event and applies per-row INSERT/UPDATE/DELETE inside a transaction,
+so write cost follows the size of the change instead of the table. Both
+store the text form and hand out frames in the typed schema of
+``events_core.schema`` (``apply_schema`` runs once per load).
+
+Writes are safe with several admins: EventIDs come from a persisted
+sequence that never goes back, every row carries a Version that each update
+bumps, and update/delete can be given the versions the caller last saw so a
+concurrent change raises ``StaleEventError`` instead of being overwritten.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from events_core.schema import (
+    COLUMNS, DATE_COLUMNS, MISSING_DAY, TIME_COLUMNS, apply_schema, day_to_date,
+    minutes_to_text, to_day, to_text_frame,
+)
+
+# frame column -> sqlite column
+SQL_COLUMNS = {
+    "EventID": "event_id",
+    "Program": "program",
+    "Category": "category",
+    "Start Date": "start_date",
+    "End Date": "end_date",
+    "Start Time": "start_time",
+    "End Time": "end_time",
+    "All Day": "all_day",
+    "Version": "version",
+}
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Change records kept in the journal; every JOURNAL_LIMIT records the older
+# half is dropped (readers that far behind reload the whole store)
+JOURNAL_LIMIT = 1000
+
+# A write touching more than this share of the events is journaled as a
+# "reset" rather than with its rows: LiveEvents reloads for such a delta
+# anyway, and a multi-MB record would be re-read by every changes_since()
+RELOAD_SHARE = 0.25
+
+
+# ==================================================
+# HELPERS
+# ==================================================
+def file_signature(path):
+    """Identity of a file: (mtime_ns, size, inode), or None if missing"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+class StaleEventError(Exception):
+    """An update or delete expected a row version that is no longer current"""
+
+    def __init__(self, event_id):
+        super().__init__(f"event {event_id} was changed or deleted by someone else")
+        self.event_id = event_id
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive advisory lock on ``path`` (created if missing) for the block"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write(path, write, binary=False):
+    """Call write(f) on a temp file next to path, then rename it over path"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", newline="")) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def _last_line(path, block=8192):
+    """Last complete (newline-terminated) line of a text file ('' if none)"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return ""
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        stop = None     # offset of the newline that ends the last complete line
+        while pos > 0:
+            lo = max(0, pos - block)
+            f.seek(lo)
+            chunk = f.read(pos - lo)
+            # Only the block just read is searched: one pass however long the line
+            i = chunk.rfind(b"\n")
+            while i >= 0:
+                if stop is None:
+                    stop = lo + i
+                else:
+                    f.seek(lo + i + 1)
+                    return f.read(stop - lo - i - 1).decode()
+                i = chunk.rfind(b"\n", 0, i)
+            pos = lo
+        if stop is None:
+            return ""
+        f.seek(0)
+        return f.read(stop).decode()
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _journal_op(op, n, total):
+    """op for a write of n rows to a store of total rows, or "reset" when
+    the write is large enough that replaying it costs more than a reload"""
+    return "reset" if n > max(total, 1) * RELOAD_SHARE else op
+
+def _versions(col):
+    """Stored row versions as ints ('' counts as 1)"""
+    return pd.to_numeric(col, errors="coerce").fillna(1).astype(int)
+
+def iso_date(d):
+    """Date-like value or day number -> 'YYYY-MM-DD' ('' for missing)"""
+    if d is None or (not isinstance(d, str) and pd.isna(d)) or d == "":
+        return ""
+    day = to_day(d)
+    return "" if day == MISSING_DAY else day_to_date(day).isoformat()
+
+def to_record(event):
+    """Storage form of an event mapping (typed or text values)"""
+    rec = {}
+    for col in COLUMNS:
+        # Row versions are maintained by the store
+        if col not in event or col == "Version":
+            continue
+        v = event[col]
+        if col == "EventID":
+            v = None if v is None or pd.isna(v) else int(v)
+        elif col in DATE_COLUMNS:
+            v = iso_date(v)
+        elif col in TIME_COLUMNS and isinstance(v, (int, np.integer)):
+            v = minutes_to_text(v)
+        elif col == "All Day" and isinstance(v, (bool, np.bool_)):
+            v = str(bool(v))
+        else:
+            v = "" if v is None or pd.isna(v) else str(v)
+        rec[col] = v
+    return rec
+
+def to_storage_frame(df):
+    """Any events frame (typed or text) -> the stored text form"""
+    return to_text_frame(apply_schema(df))
+
+
+# ==================================================
+# BACKENDS
+# ==================================================
+class EventStore:
+    """Common interface; ``query`` falls back to filtering ``load()``"""
+
+    def version(self):
+        """Hashable token that changes whenever the data changes"""
+        raise NotImplementedError
+
+    def load(self):
+        raise NotImplementedError
+
+    def insert(self, event):
+        """Add one event, taking an EventID from the sequence if missing. Returns the id."""
+        raise NotImplementedError
+
+    def insert_many(self, df):
+        """Add every row of df in one write with a batch of new EventIDs
+        (any EventID column is ignored). Returns the ids."""
+        raise NotImplementedError
+
+    def update(self, event_id, changes, version=None):
+        """Change one event and bump its Version. With ``version``, raise
+        StaleEventError unless that is still the stored Version."""
+        raise NotImplementedError
+
+    def update_many(self, event_ids, changes, versions=None):
+        """update() for several events in one write, all or nothing. Returns the row count."""
+        raise NotImplementedError
+
+    def delete(self, event_ids, versions=None):
+        """Delete events; ``versions`` as in update_many()"""
+        raise NotImplementedError
+
+    def restore(self, df):
+        """Insert rows with their own EventIDs and Versions in one locked
+        write (e.g. from the archive); a row whose EventID is stored already
+        is skipped, the stored one being newer. Returns the inserted count."""
+        raise NotImplementedError
+
+    def replace_all(self, df):
+        raise NotImplementedError
+
+    # ---- change journal ----
+    # Every write appends one record {"seq", "op", ...}: "upsert" with the
+    # stored rows as they are now, "delete" with the EventIDs, or "reset"
+    # (everything may have changed; also written instead of an upsert or
+    # delete touching more than RELOAD_SHARE of the rows). Sequence numbers
+    # only go up.
+
+    def journal_seq(self):
+        """Sequence number of the last change record (0 if none)"""
+        raise NotImplementedError
+
+    def changes_since(self, seq):
+        """Change records after ``seq`` and the new last seq, or None when
+        they cannot be replayed (journal compacted past seq, or the data was
+        changed without going through the store): reload instead."""
+        raise NotImplementedError
+
+    def query(self, program=None, category=None,
+              start_from=None, end_until=None, end_from=None):
+        """Events matching every given filter (None = not filtered)"""
+        df = self.load()
+        mask = pd.Series(True, index=df.index)
+        if program is not None:
+            mask &= df["Program"] == program
+        if category is not None:
+            mask &= df["Category"] == category
+        if start_from is not None:
+            mask &= df["Start Date"] >= to_day(start_from)
+        if end_until is not None:
+            mask &= (df["End Date"] <= to_day(end_until)) & (df["End Date"] != MISSING_DAY)
+        if end_from is not None:
+            mask &= df["End Date"] >= to_day(end_from)
+        return df[mask]
+
+
+class CsvStore(EventStore):
+    """events.csv.
+
+    Writers serialize on ``<path>.lock``. An insert appends its line with a
+    single write(); every other write goes to a temp file that is renamed over
+    the original, so readers (which take no lock) see the old file or the new
+    one, never a torn one. EventIDs come from the ``<path>.seq`` sequence,
+    which only moves forward.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock_path = path + ".lock"
+        self._seq_path = path + ".seq"
+        self._journal_path = path + ".journal"
+
+    def version(self):
+        return file_signature(self.path)
+
+    def _load_text(self):
+        try:
+            df = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        except FileNotFoundError:
+            df = pd.DataFrame(columns=COLUMNS)
+        df = df.reindex(columns=COLUMNS, fill_value="")
+        df["Version"] = df["Version"].replace("", "1")
+        return df
+
+    def load(self):
+        return apply_schema(self._load_text())
+
+    def _write_text(self, text):
+        atomic_write(self.path, lambda f: text.to_csv(f, index=False))
+
+    def _max_file_id(self, text=None):
+        """Highest EventID in the data file (0 if none)"""
+        if text is None:
+            try:
+                text = pd.read_csv(self.path, usecols=["EventID"], dtype=str,
+                                   keep_default_na=False)
+            except FileNotFoundError:
+                return 0
+        ids = pd.to_numeric(text["EventID"], errors="coerce")
+        return 0 if ids.isna().all() else int(ids.max())
+
+    def _last_id(self, text=None):
+        """Last EventID handed out (call with the lock held)"""
+        try:
+            with open(self._seq_path) as f:
+                last = int(f.read().strip() or 0)
+        except FileNotFoundError:
+            last = 0
+        # Rows added to the file by hand may be ahead of the sequence
+        return max(last, self._max_file_id(text))
+
+    def _set_last_id(self, last):
+        atomic_write(self._seq_path, lambda f: f.write(f"{last}\n"))
+
+    def _take_ids(self, n, text=None):
+        """Reserve n new EventIDs (lock held)"""
+        last = self._last_id(text)
+        self._set_last_id(last + n)
+        return list(range(last + 1, last + n + 1))
+
+    def _bump_seq(self, ids, text=None):
+        """Keep the sequence ahead of explicitly given ids (lock held)"""
+        ids = [int(i) for i in ids]
+        last = self._last_id(text)
+        # Also persists a sequence that so far was only derived from the file
+        if ids and (max(ids) > last or not os.path.exists(self._seq_path)):
+            self._set_last_id(max(last, max(ids)))
+
+    def journal_seq(self):
+        line = _last_line(self._journal_path)
+        return json.loads(line)["seq"] if line else 0
+
+    def _log(self, op, rows=None, ids=None):
+        """Append a change record after the data file was written (lock held).
+
+        Each record carries the data file signature it produced, so a file
+        edited behind the store's back is noticed by changes_since().
+        """
+        seq = self.journal_seq() + 1
+        rec = {"seq": seq, "op": op, "sig": list(file_signature(self.path) or ())}
+        if rows is not None:
+            rec["rows"] = rows
+        if ids is not None:
+            rec["ids"] = [int(i) for i in ids]
+        fd = os.open(self._journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(rec, separators=(",", ":")) + "\n").encode())
+        finally:
+            os.close(fd)
+        if seq % JOURNAL_LIMIT == 0:
+            keep = [r for r in self._read_journal() if r["seq"] > seq - JOURNAL_LIMIT // 2]
+            atomic_write(self._journal_path, lambda f: f.writelines(
+                json.dumps(r, separators=(",", ":")) + "\n" for r in keep))
+
+    def _read_journal(self):
+        try:
+            with open(self._journal_path) as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return []
+        # Readers take no lock: the last piece is "" unless a record is
+        # still being appended, in which case it is skipped
+        return [json.loads(line) for line in lines[:-1] if line.strip()]
+
+    def changes_since(self, seq):
+        records = self._read_journal()
+        if not records or records[0]["seq"] > seq + 1:
+            return None
+        if records[-1]["sig"] != list(file_signature(self.path) or ()):
+            return None
+        return [r for r in records if r["seq"] > seq], records[-1]["seq"]
+
+    def _current_layout(self):
+        """Rewrite a file without the Version column (older layout) once (lock held)"""
+        try:
+            with open(self.path, newline="") as f:
+                header = next(csv.reader(f), None)
+        except FileNotFoundError:
+            return
+        if header is not None and header != COLUMNS:
+            self._write_text(to_storage_frame(self._load_text()))
+            self._log("reset")
+
+    def insert(self, event):
+        rec = to_record(event)
+        with file_lock(self._lock_path):
+            self._current_layout()
+            if rec.get("EventID") is None:
+                rec["EventID"] = self._take_ids(1)[0]
+            else:
+                self._bump_seq([rec["EventID"]])
+            rec["Version"] = 1
+            row = [rec.get(col, "") for col in COLUMNS]
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            if file_signature(self.path) is None:
+                writer.writerow(COLUMNS)
+            elif not _ends_with_newline(self.path):
+                # A hand-edited file may lack the final newline
+                buf.write("\n")
+            writer.writerow(row)
+            # One write() of one line: readers see all of it or none of it
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, buf.getvalue().encode())
+            finally:
+                os.close(fd)
+            self._log("upsert", rows=[dict(zip(COLUMNS, map(str, row)))])
+        return rec["EventID"]
+
+    def insert_many(self, df):
+        out = to_storage_frame(df)
+        with file_lock(self._lock_path):
+            text = self._load_text()
+            out["EventID"] = self._take_ids(len(out), text)
+            out["Version"] = 1
+            out = out.astype(str)
+            self._write_text(pd.concat([text, out], ignore_index=True))
+            op = _journal_op("upsert", len(out), len(text))
+            self._log(op, rows=out.to_dict("records") if op == "upsert" else None)
+        return [int(i) for i in out["EventID"]]
+
+    @staticmethod
+    def _check_versions(text, ids, versions):
+        if versions is None:
+            return
+        current = dict(zip(pd.to_numeric(text["EventID"]).tolist(), _versions(text["Version"])))
+        for event_id, expected in zip(ids, versions):
+            if current.get(event_id) != int(expected):
+                raise StaleEventError(event_id)
+
+    def update(self, event_id, changes, version=None):
+        return self.update_many([event_id], changes,
+                                None if version is None else [version])
+
+    def update_many(self, event_ids, changes, versions=None):
+        ids = [int(i) for i in event_ids]
+        rec = to_record(changes)
+        rec.pop("EventID", None)
+        with file_lock(self._lock_path):
+            text = self._load_text()
+            self._check_versions(text, ids, versions)
+            mask = pd.to_numeric(text["EventID"]).isin(ids)
+            for col, v in rec.items():
+                text.loc[mask, col] = v
+            text.loc[mask, "Version"] = (_versions(text.loc[mask, "Version"]) + 1).astype(str)
+            self._write_text(text)
+            op = _journal_op("upsert", int(mask.sum()), len(text))
+            self._log(op, rows=text[mask].to_dict("records") if op == "upsert" else None)
+        return int(mask.sum())
+
+    def delete(self, event_ids, versions=None):
+        ids = [int(i) for i in event_ids]
+        with file_lock(self._lock_path):
+            text = self._load_text()
+            self._check_versions(text, ids, versions)
+            # Before the rows go: a store without a .seq file yet would
+            # otherwise count on from the remaining ids and reuse these
+            self._bump_seq(ids, text)
+            keep = ~pd.to_numeric(text["EventID"]).isin(ids)
+            self._write_text(text[keep])
+            op = _journal_op("delete", len(ids), len(text))
+            self._log(op, ids=ids if op == "delete" else None)
+        return int((~keep).sum())
+
+    def restore(self, df):
+        out = to_storage_frame(df).astype(str)
+        with file_lock(self._lock_path):
+            text = self._load_text()
+            stored = pd.to_numeric(text["EventID"], errors="coerce")
+            out = out[~pd.to_numeric(out["EventID"]).isin(stored)]
+            if out.empty:
+                return 0
+            self._bump_seq(out["EventID"].tolist())
+            self._write_text(pd.concat([text, out], ignore_index=True))
+            op = _journal_op("upsert", len(out), len(text))
+            self._log(op, rows=out.to_dict("records") if op == "upsert" else None)
+        return len(out)
+
+    def replace_all(self, df):
+        out = to_storage_frame(df)
+        with file_lock(self._lock_path):
+            self._bump_seq(out["EventID"].tolist())
+            self._write_text(out)
+            self._log("reset")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id   INTEGER PRIMARY KEY,
+    program    TEXT NOT NULL,
+    category   TEXT NOT NULL,
+    start_date TEXT,
+    end_date   TEXT,
+    start_time TEXT NOT NULL DEFAULT '',
+    end_time   TEXT NOT NULL DEFAULT '',
+    all_day    TEXT NOT NULL DEFAULT 'False',
+    version    INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_events_program ON events(program);
+CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
+CREATE INDEX IF NOT EXISTS idx_events_start_date ON events(start_date);
+CREATE INDEX IF NOT EXISTS idx_events_end_date ON events(end_date);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('last_id', 0);
+CREATE TABLE IF NOT EXISTS changes (
+    seq  INTEGER PRIMARY KEY AUTOINCREMENT,
+    op   TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+"""
+
+_SELECT = "SELECT " + ", ".join(
+    f'{sql} AS "{col}"' for col, sql in SQL_COLUMNS.items()
+) + " FROM events"
+
+_INSERT = "INSERT INTO events ({}) VALUES ({})".format(
+    ", ".join(SQL_COLUMNS.values()), ", ".join("?" * len(SQL_COLUMNS))
+)
+
+
+class SqliteStore(EventStore):
+    """SQLite in WAL mode: readers never wait on the writer.
+
+    Every write transaction bumps ``meta.version``, which is what
+    ``version()`` reports to caches. ``meta.last_id`` is the EventID
+    sequence, so ids of deleted events are never handed out again. The
+    ``changes`` table is the change journal, written in the same transaction
+    as the rows it describes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+            if "version" not in cols:
+                # Stores created before row versions
+                conn.execute("ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _take_ids(conn, n):
+        """Reserve n new EventIDs inside a write transaction"""
+        last = conn.execute(
+            "SELECT MAX((SELECT value FROM meta WHERE key = 'last_id'),"
+            " (SELECT COALESCE(MAX(event_id), 0) FROM events))"
+        ).fetchone()[0]
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'last_id'", (last + n,))
+        return list(range(last + 1, last + n + 1))
+
+    def version(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()[0]
+
+    @staticmethod
+    def _count(conn):
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    @staticmethod
+    def _log(conn, op, ids=None):
+        """Journal a change inside the write transaction; for "upsert" the
+        rows of ``ids`` are read back as stored"""
+        if op == "upsert":
+            body = {"rows": []}
+            for lo in range(0, len(ids), 500):
+                part = [int(i) for i in ids[lo:lo + 500]]
+                cur = conn.execute(f"{_SELECT} WHERE event_id IN ({', '.join('?' * len(part))})",
+                                   part)
+                body["rows"] += [dict(zip(SQL_COLUMNS, r)) for r in cur]
+        elif op == "delete":
+            body = {"ids": [int(i) for i in ids]}
+        else:
+            body = {}
+        seq = conn.execute("INSERT INTO changes (op, body) VALUES (?, ?)",
+                           (op, json.dumps(body, separators=(",", ":")))).lastrowid
+        if seq % JOURNAL_LIMIT == 0:
+            conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - JOURNAL_LIMIT // 2,))
+
+    def journal_seq(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, seq):
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            first = conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+            if first is None or first > seq + 1:
+                conn.execute("COMMIT")
+                return None
+            rows = conn.execute("SELECT seq, op, body FROM changes WHERE seq > ? ORDER BY seq",
+                                (seq,)).fetchall()
+            conn.execute("COMMIT")
+        records = [{"seq": n, "op": op, **json.loads(body)} for n, op, body in rows]
+        return records, records[-1]["seq"] if records else seq
+
+    def _select(self, where="", params=()):
+        with self._connect() as conn:
+            df = pd.read_sql_query(f"{_SELECT}{where} ORDER BY event_id", conn,
+                                   params=params)
+        return apply_schema(df)
+
+    def load(self):
+        return self._select()
+
+    def query(self, program=None, category=None,
+              start_from=None, end_until=None, end_from=None):
+        clauses, params = [], []
+        for sql, op, v in (
+            ("program", "=", program),
+            ("category", "=", category),
+            ("start_date", ">=", start_from),
+            ("end_date", "<=", end_until),
+            ("end_date", ">=", end_from),
+        ):
+            if v is None:
+                continue
+            clauses.append(f"{sql} {op} ?")
+            params.append(iso_date(v) if sql.endswith("_date") else v)
+        if end_until is not None:
+            clauses.append("end_date <> ''")
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return self._select(where, params)
+
+    def insert(self, event):
+        rec = to_record(event)
+        with self._transaction() as conn:
+            if rec.get("EventID") is None:
+                rec["EventID"] = self._take_ids(conn, 1)[0]
+            cols = list(rec)
+            sql = "INSERT INTO events ({}) VALUES ({})".format(
+                ", ".join(SQL_COLUMNS[c] for c in cols), ", ".join("?" * len(cols))
+            )
+            conn.execute(sql, [rec[c] for c in cols])
+            self._log(conn, "upsert", [rec["EventID"]])
+        return rec["EventID"]
+
+    def insert_many(self, df):
+        out = to_storage_frame(df).drop(columns=["EventID", "Version"])
+        with self._transaction() as conn:
+            total = self._count(conn)
+            ids = self._take_ids(conn, len(out))
+            rows = out.itertuples(index=False, name=None)
+            conn.executemany(_INSERT, [(i, *r, 1) for i, r in zip(ids, rows)])
+            self._log(conn, _journal_op("upsert", len(ids), total), ids)
+        return ids
+
+    def update(self, event_id, changes, version=None):
+        return self.update_many([event_id], changes,
+                                None if version is None else [version])
+
+    def update_many(self, event_ids, changes, versions=None):
+        rec = to_record(changes)
+        rec.pop("EventID", None)
+        if not rec:
+            return 0
+        sql = "UPDATE events SET {}, version = version + 1 WHERE event_id = ?".format(
+            ", ".join(f"{SQL_COLUMNS[c]} = ?" for c in rec)
+        )
+        values = list(rec.values())
+        with self._transaction() as conn:
+            if versions is None:
+                n = conn.executemany(sql, [[*values, int(i)] for i in event_ids]).rowcount
+            else:
+                for event_id, expected in zip(event_ids, versions):
+                    cur = conn.execute(sql + " AND version = ?",
+                                       [*values, int(event_id), int(expected)])
+                    if cur.rowcount == 0:
+                        raise StaleEventError(event_id)
+                n = len(event_ids)
+            self._log(conn, _journal_op("upsert", len(event_ids), self._count(conn)),
+                      list(event_ids))
+            return n
+
+    def delete(self, event_ids, versions=None):
+        with self._transaction() as conn:
+            total = self._count(conn)
+            if versions is None:
+                ids = [(int(i),) for i in event_ids]
+                n = conn.executemany("DELETE FROM events WHERE event_id = ?", ids).rowcount
+            else:
+                for event_id, expected in zip(event_ids, versions):
+                    cur = conn.execute("DELETE FROM events WHERE event_id = ? AND version = ?",
+                                       (int(event_id), int(expected)))
+                    if cur.rowcount == 0:
+                        raise StaleEventError(event_id)
+                n = len(event_ids)
+            self._log(conn, _journal_op("delete", len(event_ids), total), list(event_ids))
+            return n
+
+    def restore(self, df):
+        out = to_storage_frame(df)
+        rows = [[int(r[0]), *r[1:-1], int(r[-1])] for r in out.itertuples(index=False, name=None)]
+        with self._transaction() as conn:
+            total = self._count(conn)
+            stored = set()
+            for lo in range(0, len(rows), 500):
+                part = [r[0] for r in rows[lo:lo + 500]]
+                stored.update(i for (i,) in conn.execute(
+                    f"SELECT event_id FROM events WHERE event_id IN ({', '.join('?' * len(part))})",
+                    part))
+            rows = [r for r in rows if r[0] not in stored]
+            if not rows:
+                return 0
+            conn.executemany(_INSERT, rows)
+            conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'last_id'",
+                         (max(r[0] for r in rows),))
+            ids = [r[0] for r in rows]
+            self._log(conn, _journal_op("upsert", len(ids), total), ids)
+        return len(rows)
+
+    def replace_all(self, df):
+        if df["EventID"].isna().any():
+            raise ValueError("replace_all() needs an EventID on every row")
+        out = to_storage_frame(df)
+        rows = out.itertuples(index=False, name=None)
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM events")
+            conn.executemany(_INSERT, [[int(r[0]), *r[1:-1], int(r[-1])] for r in rows])
+            conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'last_id'",
+                         (int(out["EventID"].max()) if len(out) else 0,))
+            self._log(conn, "reset")
+
+
+def open_store(path):
+    """Pick the backend from the file suffix (.db/.sqlite -> SQLite)"""
+    if str(path).lower().endswith(SQLITE_SUFFIXES):
+        return SqliteStore(path)
+    return CsvStore(path)
+
+def migrate_csv(csv_path, db_path, renumber=False):
+    """One-shot copy of an events.csv into a SQLite store. Returns the row count.
+
+    Rows with a blank or repeated EventID (older versions could write
+    duplicates) raise ValueError naming their CSV lines, unless
+    ``renumber``: then the first row keeps the id and the others get new
+    ones after the highest.
+    """
+    store = CsvStore(csv_path)
+    text = store._load_text()
+    ids = pd.to_numeric(text["EventID"], errors="coerce")
+    bad = ids.isna() | ids.duplicated()
+    df = apply_schema(text)
+    if bad.any():
+        # Line 1 is the header
+        lines = ", ".join(str(i + 2) for i in np.flatnonzero(bad)[:20])
+        if not renumber:
+            raise ValueError(f"{csv_path}: blank or duplicate EventID on line(s) {lines}"
+                             f"{' ...' if bad.sum() > 20 else ''}; rerun with --renumber "
+                             "to give those rows new ids")
+        last = int(max(ids.max(skipna=True) if ids.notna().any() else 0,
+                       store._last_id(text)))
+        df.loc[bad.to_numpy(), "EventID"] = np.arange(last + 1, last + 1 + int(bad.sum()))
+    SqliteStore(db_path).replace_all(df)
+    return len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate events.csv to SQLite")
+    parser.add_argument("csv_path")
+    parser.add_argument("db_path")
+    parser.add_argument("--renumber", action="store_true",
+                        help="give rows with a blank or duplicate EventID new ids")
+    args = parser.parse_args()
+    try:
+        n = migrate_csv(args.csv_path, args.db_path, args.renumber)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    print(f"Migrated {n} events to {args.db_path}")
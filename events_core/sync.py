@@ -0,0 +1,94 @@
+"""Keep an in-memory copy of the events current from the store's change journal.
+
+``LiveEvents`` loads the store once, remembering the journal sequence number
+it saw, and builds the derived state every session shares: the EventID-sorted
+typed frame, the statistics (``EventStats``) and the search index
+(``SearchIndex``). ``sync()`` then asks the store only for the change records
+after that sequence number and applies them: the changed rows are swapped in
+the frame and the statistics and search index are updated for just those
+events. A full reload happens only when the journal cannot be replayed (it
+was compacted past the last seen record, or the file was edited by hand), on
+a "reset" record (the store journals large writes that way), or when
+several deltas together touch a large share of the events.
+"""
+import threading
+
+import pandas as pd
+
+from events_core.schema import apply_schema, concat_typed
+from events_core.search import SearchIndex
+from events_core.stats import EventStats
+from events_core.storage import RELOAD_SHARE
+
+
+class LiveEvents:
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.RLock()
+        self.generation = 0
+        self.reloads = 0
+        self._reload()
+
+    @property
+    def token(self):
+        """Changes whenever the frame does; a cache key for derived views"""
+        return self.generation, self.seq
+
+    def _reload(self):
+        # Read the sequence number first: records written between the two
+        # reads are replayed on the next sync(), which is harmless
+        seq = self.store.journal_seq()
+        version = self.store.version()
+        df = self.store.load().sort_values("EventID", kind="stable").reset_index(drop=True)
+        self.df, self.seq, self.version = df, seq, version
+        self.stats = EventStats(df)
+        self.search = SearchIndex(df)
+        self.generation += 1
+        self.reloads += 1
+
+    def sync(self):
+        """Bring the frame up to date with the store; returns self.token"""
+        with self._lock:
+            version = self.store.version()
+            if version == self.version:
+                return self.token
+            delta = self.store.changes_since(self.seq)
+            if delta is None:
+                self._reload()
+                return self.token
+            records, seq = delta
+            if any(r["op"] not in ("upsert", "delete") for r in records) or (
+                    sum(len(r.get("rows", r.get("ids", ()))) for r in records)
+                    > max(len(self.df), 1) * RELOAD_SHARE):
+                self._reload()
+                return self.token
+            for rec in records:
+                self._apply(rec)
+            self.seq, self.version = seq, version
+            return self.token
+
+    def _apply(self, rec):
+        """Swap one change record's rows into the frame, stats and index"""
+        if rec["op"] == "upsert":
+            new = apply_schema(pd.DataFrame(rec["rows"]))
+            ids = new["EventID"]
+        else:
+            new = None
+            ids = pd.Series(rec["ids"], dtype="int64")
+        if not len(ids):
+            return
+        gone = self.df["EventID"].isin(ids)
+        old = self.df[gone]
+        for event in old.to_dict("records"):
+            self.stats.remove(event)
+        self.search.remove(old)
+        frames = [self.df[~gone]]
+        if new is not None:
+            frames.append(new)
+            for event in new.to_dict("records"):
+                self.stats.add(event)
+            self.search.add(new)
+        df = concat_typed(frames)
+        self.df = df.sort_values("EventID", kind="stable").reset_index(drop=True)
+        self.generation += 1
@@ -0,0 +1,32 @@
+"""Half-hour time slots offered by the admin forms, computed once at import.
+
+SLOT_LABELS are the selectbox options ("12:00 AM" ... "11:30 PM") and
+SLOT_TIMES the matching ``datetime.time`` values; LABEL_TIME and
+LABEL_MINUTES map a chosen label back. ``nearest_slot`` rounds minutes
+since midnight to the closest slot index arithmetically instead of
+scanning the list.
+"""
+from datetime import time
+
+from events_core.schema import minutes_to_text
+
+SLOT_MINUTES = 30
+
+SLOT_STARTS = tuple(range(0, 24 * 60, SLOT_MINUTES))
+SLOT_TIMES = tuple(time(*divmod(m, 60)) for m in SLOT_STARTS)
+SLOT_LABELS = tuple(minutes_to_text(m) for m in SLOT_STARTS)
+
+LABEL_TIME = dict(zip(SLOT_LABELS, SLOT_TIMES))
+LABEL_MINUTES = dict(zip(SLOT_LABELS, SLOT_STARTS))
+
+# Form defaults: 10:00 AM to 5:00 PM
+DEFAULT_START_SLOT = 10 * 60 // SLOT_MINUTES
+DEFAULT_END_SLOT = 17 * 60 // SLOT_MINUTES
+
+
+def nearest_slot(minutes, default=0):
+    """Index of the slot closest to ``minutes`` (earlier slot on a tie);
+    ``default`` when minutes is None or negative (blank time)"""
+    if minutes is None or minutes < 0:
+        return default
+    return min((int(minutes) + SLOT_MINUTES // 2 - 1) // SLOT_MINUTES, len(SLOT_STARTS) - 1)
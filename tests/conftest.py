@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events_core.storage import open_store  # noqa: E402
+
+
+@pytest.fixture(params=["events.csv", "events.db"])
+def store_path(request, tmp_path):
+    """Path of an empty store, once per backend"""
+    return str(tmp_path / request.param)
+
+
+@pytest.fixture
+def store(store_path):
+    return open_store(store_path)
+
+
+def make_event(i, program="KEAM", category="Final Allotment"):
+    day = 1 + i % 28
+    return {
+        "Program": program,
+        "Category": category,
+        "Start Date": f"2026-03-{day:02d}",
+        "End Date": f"2026-03-{min(day + i % 3, 28):02d}",
+        "Start Time": "10:00 AM",
+        "End Time": "12:00 PM",
+        "All Day": "False",
+    }
@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from conftest import make_event
+from events_core.archive import Archive, archive_events, restore_year
+from events_core.stats import CombinedStats, EventStats
+from events_core.storage import StaleEventError
+
+
+@pytest.fixture
+def filled(store):
+    for i in range(6):
+        store.insert(make_event(i))
+    return store
+
+
+def test_stale_delete_leaves_nothing_archived(filled, monkeypatch):
+    delete = filled.delete
+
+    def racing_delete(ids, versions=None):
+        # Another admin edits an event between the archive write and the delete
+        filled.update(ids[0], {"Category": "Result"})
+        return delete(ids, versions)
+
+    monkeypatch.setattr(filled, "delete", racing_delete)
+    with pytest.raises(StaleEventError):
+        archive_events(filled, date(2026, 4, 1))
+    archive = Archive(filled.path)
+    assert len(archive) == 0 and archive.years() == []
+    assert CombinedStats(EventStats(filled.load()), archive.stats()).total == 6
+
+
+def test_archive_and_restore_round_trip(filled):
+    before = filled.load()
+    assert archive_events(filled, date(2026, 4, 1)) == 6
+    assert filled.load().empty and len(Archive(filled.path)) == 6
+    assert restore_year(filled, 2026) == 6
+    assert filled.load().equals(before)
+    assert Archive(filled.path).years() == []
+
+
+def test_restore_keeps_writes_made_meanwhile(filled):
+    archive_events(filled, date(2026, 4, 1))
+    new_id = filled.insert(make_event(10))
+    assert new_id == 7
+    restore_year(filled, 2026)
+    df = filled.load()
+    assert sorted(df["EventID"]) == list(range(1, 8))
+
+
+def test_restore_unknown_year(filled):
+    with pytest.raises(ValueError):
+        restore_year(filled, 1999)
@@ -0,0 +1,79 @@
+import io
+
+import pandas as pd
+import pytest
+
+from events_core.bulk import export_events, read_table, validate
+from events_core.schema import to_day
+
+HEADER = "Program,Category,Start Date,End Date,Start Time,End Time,All Day\n"
+
+
+def _validate(rows):
+    return validate(read_table(io.StringIO(HEADER + "\n".join(rows) + "\n"), "csv"))
+
+
+def _errors(result):
+    return list(result.errors[["Row", "Column", "Error"]].itertuples(index=False, name=None))
+
+
+def test_valid_rows_are_typed():
+    result = _validate([
+        "KEAM,Final Allotment,2026-05-01,2026-05-01,10:00 AM,12:00 PM,False",
+        "LLM,Memo Clearance,2026-05-02,2026-05-04,,,True",
+    ])
+    assert result.errors.empty and result.rejected == 0
+    df = result.valid
+    assert df["Start Date"].tolist() == [to_day("2026-05-01"), to_day("2026-05-02")]
+    assert df["Start Time"].tolist() == [600, -1]
+    assert df["All Day"].tolist() == [False, True]
+
+
+@pytest.mark.parametrize("row,column,error", [
+    ("CAT,Final Allotment,2026-05-01,2026-05-01,,,True", "Program", "unknown program"),
+    ("KEAM,Exam,2026-05-01,2026-05-01,,,True", "Category", "unknown category"),
+    ("KEAM,Final Allotment,2026-13-01,2026-05-01,,,True", "Start Date", "missing or not a date"),
+    ("KEAM,Final Allotment,2026-05-01,,,,True", "End Date", "missing or not a date"),
+    ("KEAM,Final Allotment,2026-05-03,2026-05-01,,,True", "End Date", "End Date before Start Date"),
+    ("KEAM,Final Allotment,2026-05-01,2026-05-01,,,maybe", "All Day", "expected True or False"),
+    ("KEAM,Final Allotment,2026-05-01,2026-05-01,25:00,,False", "Start Time", "not a time"),
+    ("KEAM,Final Allotment,2026-05-01,2026-05-01,10 AM,soon,False", "End Time", "not a time"),
+    ("KEAM,Final Allotment,2026-05-01,2026-05-01,2 PM,1 PM,False", "End Time",
+     "End Time before Start Time"),
+])
+def test_bad_rows_are_reported(row, column, error):
+    good = "KEAM,Final Allotment,2026-05-01,2026-05-01,10:00 AM,12:00 PM,False"
+    result = _validate([good, row, good])
+    assert _errors(result) == [(2, column, error)]
+    assert result.rejected == 1 and len(result.valid) == 2
+
+
+def test_all_day_rows_ignore_times():
+    result = _validate(["KEAM,Final Allotment,2026-05-01,2026-05-01,soon,later,True",
+                        "KEAM,Final Allotment,2026-05-01,2026-05-02,2 PM,1 PM,False"])
+    assert result.errors.empty
+    assert result.valid["Start Time"].tolist() == [-1, 840]
+
+
+def test_every_error_of_a_row_is_listed():
+    result = _validate(["KEAM,Final Allotment,2026-05-01,2026-05-01,,,False",
+                        "CAT,Exam,someday,2026-05-01,x,,False"])
+    assert _errors(result) == [(2, "Program", "unknown program"),
+                               (2, "Category", "unknown category"),
+                               (2, "Start Date", "missing or not a date"),
+                               (2, "Start Time", "not a time")]
+    assert result.rejected == 1
+
+
+def test_missing_columns():
+    with pytest.raises(ValueError, match="End Date"):
+        validate(pd.DataFrame({"Program": [], "Category": [], "Start Date": []}))
+
+
+def test_export_reads_back():
+    result = _validate(["KEAM,Final Allotment,2026-05-01,2026-05-01,10:00 AM,12:00 PM,False"])
+    out = io.StringIO()
+    export_events(result.valid, out, "csv")
+    again = validate(read_table(io.StringIO(out.getvalue()), "csv"))
+    assert again.errors.empty
+    pd.testing.assert_frame_equal(again.valid, result.valid)
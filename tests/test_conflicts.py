@@ -0,0 +1,111 @@
+import random
+
+import pandas as pd
+import pytest
+
+from events_core.conflicts import DAY_MINUTES, ConflictIndex, find_overlaps
+from events_core.schema import CATEGORIES, PROGRAMS, apply_schema, minutes_to_text
+
+
+def _frame(n, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        day = rng.randrange(1, 20)
+        timed = rng.random() < 0.7
+        start = rng.randrange(8, 17) * 60 + rng.choice([0, 30])
+        rows.append({
+            "EventID": i + 1, "Program": rng.choice(PROGRAMS[:3]),
+            "Category": rng.choice(CATEGORIES[:3]),
+            "Start Date": f"2026-04-{day:02d}",
+            "End Date": f"2026-04-{day + rng.choice([0, 0, 0, 1, 3]):02d}",
+            "Start Time": minutes_to_text(start) if timed else "",
+            "End Time": minutes_to_text(start + rng.choice([30, 60, 90])) if timed else "",
+            "All Day": str(not timed),
+        })
+    return apply_schema(pd.DataFrame(rows))
+
+
+def _interval(row):
+    start, end = row["Start Time"], row["End Time"]
+    if row["All Day"] or start < 0:
+        start = 0
+    if row["All Day"] or end < 0:
+        end = DAY_MINUTES
+    s = row["Start Date"] * DAY_MINUTES + start
+    return s, max(row["End Date"] * DAY_MINUTES + end, s + 1)
+
+
+def _brute_force(df, key=None):
+    rows = df.to_dict("records")
+    spans = [_interval(r) for r in rows]
+    pairs = set()
+    for i, a in enumerate(rows):
+        for j, b in enumerate(rows[:i]):
+            if key is not None and a[key] != b[key]:
+                continue
+            if spans[i][0] < spans[j][1] and spans[j][0] < spans[i][1]:
+                pairs.add(frozenset((a["EventID"], b["EventID"])))
+    return pairs
+
+
+@pytest.mark.parametrize("scope,key", [("global", None), ("program", "Program"),
+                                       ("category", "Category")])
+@pytest.mark.parametrize("seed", range(3))
+def test_find_overlaps_matches_brute_force(scope, key, seed):
+    df = _frame(150, seed)
+    found = find_overlaps(df, scope)
+    pairs = {frozenset(p) for p in zip(found["EventID"], found["Other EventID"])}
+    assert len(pairs) == len(found)
+    assert pairs == _brute_force(df, key)
+
+
+def test_find_overlaps_limit():
+    df = _frame(150, 0)
+    assert len(find_overlaps(df, limit=25)) == 25
+
+
+def _event(event_id, day, start="", end="", all_day="False"):
+    return {"EventID": event_id, "Program": "KEAM", "Category": "Final Allotment",
+            "Start Date": day, "End Date": day, "Start Time": start, "End Time": end,
+            "All Day": all_day}
+
+
+def test_same_day_times_and_all_day():
+    df = apply_schema(pd.DataFrame([
+        _event(1, "2026-04-01", "10:00 AM", "11:00 AM"),
+        # Touching at 11:00 is not an overlap
+        _event(2, "2026-04-01", "11:00 AM", "12:00 PM"),
+        _event(3, "2026-04-01", "10:30 AM", "11:15 AM"),
+        # All Day overlaps every timed event of its day, and nothing on the next
+        _event(4, "2026-04-01", all_day="True"),
+        _event(5, "2026-04-02", all_day="True"),
+    ]))
+    found = find_overlaps(df)
+    minutes = {frozenset(p): m for p, m in zip(zip(found["EventID"], found["Other EventID"]),
+                                               found["Overlap Minutes"])}
+    assert set(minutes) == {frozenset(p) for p in [(1, 3), (2, 3), (1, 4), (2, 4), (3, 4)]}
+    assert minutes[frozenset((1, 3))] == 30 and minutes[frozenset((3, 4))] == 45
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conflict_index_matches_brute_force(seed):
+    df = _frame(150, seed)
+    index = ConflictIndex(df)
+    for event in _frame(40, seed + 100).to_dict("records"):
+        event["EventID"] = None
+        expected = {next(iter(p - {0})) for p in
+                    _brute_force(pd.concat([df, pd.DataFrame([{**event, "EventID": 0}])]),
+                                 "Category") if 0 in p}
+        assert set(index.conflicts(event)["EventID"]) == expected
+
+
+def test_conflict_index_text_event_and_own_id():
+    df = _frame(150, 0)
+    index = ConflictIndex(df)
+    row = df.iloc[0]
+    event = {"EventID": int(row["EventID"]), "Category": row["Category"],
+             "Start Date": "2026-04-01", "End Date": "2026-04-30", "All Day": "True"}
+    found = index.conflicts(event)
+    expected = df[(df["Category"] == row["Category"]) & (df["EventID"] != row["EventID"])]
+    assert sorted(found["EventID"]) == sorted(expected["EventID"])
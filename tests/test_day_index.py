@@ -0,0 +1,46 @@
+import sys
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from events_core.day_index import DayIndex
+from events_core.schema import to_day
+
+
+def _frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    start = rng.integers(to_day(date(2026, 1, 1)), to_day(date(2026, 12, 31)), n)
+    return pd.DataFrame({"Start Date": start, "End Date": start + rng.integers(0, 5, n)})
+
+
+def test_positions_on_matches_a_scan():
+    df = _frame()
+    index = DayIndex(df)
+    for offset in range(0, 365, 7):
+        day = date(2026, 1, 1) + timedelta(days=offset)
+        d = to_day(day)
+        expected = np.flatnonzero((df["Start Date"] <= d) & (df["End Date"] >= d))
+        assert sorted(index.positions_on(day)) == expected.tolist()
+
+
+def test_concurrent_month_fills_add_each_event_once():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        df = _frame(20000)
+        days = [date(2026, 5, d) for d in range(1, 32)]
+        for _ in range(5):
+            index = DayIndex(df)
+            threads = [threading.Thread(target=lambda: [index.positions_on(d) for d in days])
+                       for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            for day in days:
+                positions = index.positions_on(day)
+                assert len(positions) == len(set(positions))
+    finally:
+        sys.setswitchinterval(interval)
@@ -0,0 +1,38 @@
+import itertools
+
+import pytest
+
+from events_core.schema import MISSING_MINUTE, parse_times, text_to_minutes
+
+CASES = [
+    ("10:00 AM", 600), ("2 PM", 840), ("2PM", 840), ("2:5 PM", 845), ("2:30pm", 870),
+    ("12 AM", 0), ("12:30 AM", 30), ("12 PM", 720), ("0 AM", 0), ("14 PM", 840),
+    ("14:30", 870), ("9:00", 540), ("  9:00 am ", 540), ("23:59", 1439),
+    ("14", None), ("14:", None), ("24:00", None), ("9:60", None), ("13:00 AM", 780),
+    (":30", None), ("AM", None), ("2.30 PM", None), ("1:2:3", None), ("noon", None),
+    ("١٢:٠٠", None), ("", None),
+]
+
+
+def _parsed(values):
+    minutes, bad = parse_times(values)
+    return [None if m == MISSING_MINUTE else int(m) for m in minutes], bad.tolist()
+
+
+@pytest.mark.parametrize("text,expected", CASES)
+def test_parse_times_matches_text_to_minutes(text, expected):
+    assert text_to_minutes(text) == expected
+    (minutes,), (bad,) = _parsed([text])
+    assert minutes == expected
+    assert bad == (expected is None and text != "")
+
+
+def test_parse_times_grid():
+    values = ["".join(p) for p in itertools.product(
+        ["", "0", "00", "1", "9", "12", "13", "23", "24", "007"],
+        ["", ":", ":0", ":5", ":05", ":59", ":60", ":5x"],
+        ["", "AM", " PM", "pm", "  am"])]
+    minutes, bad = _parsed(values)
+    expected = [text_to_minutes(v) for v in values]
+    assert minutes == expected
+    assert bad == [e is None and v.strip() != "" for v, e in zip(values, expected)]
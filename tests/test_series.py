@@ -0,0 +1,108 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from conftest import make_event
+from events_core.query import EventQuery
+from events_core.schema import apply_schema, day_to_date, to_day
+from events_core.series import (
+    Series, SeriesStore, expand, instantiate, make_template, occurrence_id, occurrences,
+    series_events,
+)
+
+
+def _brute_force(series, first, last):
+    """Every occurrence up to until, kept when it overlaps [first, last]"""
+    out = []
+    for n in range(series.count):
+        start = series.first_start + n * series.every
+        end = start + series.length
+        if (first is None or end >= first) and (last is None or start <= last):
+            out.append((n, start, end))
+    return out
+
+
+def _random_series(rng, series_id=1):
+    first = to_day(date(2026, 1, 1)) + rng.randrange(365)
+    return Series(series_id, "KEAM", "Option Registration", first,
+                  first + rng.randrange(200), every=rng.choice([1, 2, 7, 10, 30]),
+                  length=rng.choice([0, 0, 1, 6, 12]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_occurrences_match_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        series = _random_series(rng)
+        first = series.first_start + rng.randrange(-40, 240)
+        last = first + rng.randrange(0, 60)
+        for window in ((first, last), (first, None), (None, last), (None, None)):
+            assert list(occurrences(series, *window)) == _brute_force(series, *window)
+
+
+def test_windows_across_month_ends():
+    series = Series(1, "KEAM", "Option Registration", to_day(date(2026, 1, 28)),
+                    to_day(date(2026, 12, 31)), every=3, length=2)
+    for month in range(1, 13):
+        first = date(2026, month, 1)
+        last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        window = (to_day(first), to_day(last))
+        assert list(occurrences(series, *window)) == _brute_force(series, *window)
+
+
+def test_weekly_series_keep_their_weekday():
+    first = date(2026, 2, 23)
+    series = Series(1, "KEAM", "Option Registration", to_day(first),
+                    to_day(date(2026, 6, 30)), every=7)
+    starts = [day_to_date(s) for _, s, _ in occurrences(series, to_day(date(2026, 3, 30)),
+                                                         to_day(date(2026, 5, 3)))]
+    assert starts[0] == date(2026, 3, 30) and starts[-1] == date(2026, 4, 27)
+    assert {d.weekday() for d in starts} == {first.weekday()}
+
+
+def test_series_events_expand_only_the_query_window():
+    keam = Series(1, "KEAM", "Option Registration", to_day(date(2026, 3, 1)),
+                  to_day(date(2026, 3, 31)), every=1)
+    llm = Series(2, "LLM", "Option Registration", to_day(date(2026, 3, 1)),
+                 to_day(date(2026, 3, 31)), every=1)
+    query = EventQuery(program="KEAM", start_from=date(2026, 3, 10), end_until=date(2026, 3, 12))
+    df = series_events([keam, llm], query)
+    assert df["EventID"].tolist() == [occurrence_id(1, n) for n in (9, 10, 11)]
+    assert (df["Program"] == "KEAM").all()
+    assert len(expand([keam, llm])) == 62
+
+
+def test_template_round_trip():
+    cycle = apply_schema(pd.DataFrame([
+        make_event(4, category="Online Application"),
+        make_event(9, category="Memo Clearance"),
+        {**make_event(20, category="Final Allotment"), "All Day": "True",
+         "Start Time": "", "End Time": ""},
+    ]))
+    steps = make_template(cycle)
+    assert [s["offset"] for s in steps] == [0, 5, 16]
+    new = instantiate(steps, "LLM", date(2027, 2, 1))
+    shift = to_day(date(2027, 2, 1)) - int(cycle["Start Date"].iloc[0])
+    assert (new["Program"] == "LLM").all()
+    assert new["Category"].tolist() == cycle["Category"].tolist()
+    assert (new["Start Date"] - cycle["Start Date"]).eq(shift).all()
+    assert (new["End Date"] - cycle["End Date"]).eq(shift).all()
+    for col in ("Start Time", "End Time", "All Day"):
+        assert new[col].tolist() == cycle[col].tolist()
+
+
+def test_series_store(tmp_path):
+    store = SeriesStore(str(tmp_path / "events.csv"))
+    series = Series(0, "KEAM", "Option Registration", to_day(date(2026, 3, 1)),
+                    to_day(date(2026, 3, 31)))
+    assert [store.add(series), store.add(series)] == [1, 2]
+    store.remove(1)
+    assert [s.series_id for s in store.series()] == [2]
+    assert store.series()[0].first_start == series.first_start
+    store.save_template("cycle", [{"Category": "Result", "offset": 0, "length": 0,
+                                   "Start Time": -1, "End Time": -1, "All Day": True}])
+    assert list(store.templates()) == ["cycle"]
+    store.remove_template("cycle")
+    assert store.templates() == {}
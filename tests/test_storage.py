@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from conftest import make_event
+from events_core import storage
+from events_core.schema import apply_schema
+from events_core.storage import StaleEventError, open_store
+
+
+def _insert(path, worker, n):
+    store = open_store(path)
+    return [store.insert(make_event(worker * n + i)) for i in range(n)]
+
+
+@pytest.mark.parametrize("pool", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_concurrent_inserts_get_unique_ids(store_path, pool):
+    open_store(store_path).insert(make_event(0))
+    with pool(4) as ex:
+        ids = [i for part in ex.map(_insert, [store_path] * 4, range(4), [15] * 4) for i in part]
+    assert len(set(ids)) == len(ids) == 60
+    stored = open_store(store_path).load()["EventID"]
+    assert stored.is_unique and len(stored) == 61
+
+
+def test_ids_of_deleted_events_are_not_reused(store):
+    ids = [store.insert(make_event(i)) for i in range(3)]
+    store.delete([ids[-1]])
+    assert store.insert(make_event(3)) == ids[-1] + 1
+    assert store.insert_many(apply_schema(pd.DataFrame([make_event(4)])))[0] == ids[-1] + 2
+
+
+def test_update_with_old_version_is_stale(store):
+    event_id = store.insert(make_event(0))
+    store.update(event_id, {"Category": "Memo Clearance"}, version=1)
+    with pytest.raises(StaleEventError) as e:
+        store.update(event_id, {"Category": "Result"}, version=1)
+    assert e.value.event_id == event_id
+    row = store.load().iloc[0]
+    assert row["Category"] == "Memo Clearance" and row["Version"] == 2
+
+
+def test_update_many_is_all_or_nothing(store):
+    ids = [store.insert(make_event(i)) for i in range(3)]
+    store.update(ids[1], {"Category": "Result"})
+    with pytest.raises(StaleEventError):
+        store.update_many(ids, {"Category": "Memo Clearance"}, [1, 1, 1])
+    assert store.load()["Category"].tolist() == ["Final Allotment", "Result", "Final Allotment"]
+
+
+def test_delete_with_old_version_is_stale(store):
+    ids = [store.insert(make_event(i)) for i in range(2)]
+    store.update(ids[0], {"Category": "Result"})
+    with pytest.raises(StaleEventError):
+        store.delete(ids, [1, 1])
+    assert store.load()["EventID"].tolist() == ids
+    store.delete(ids, [2, 1])
+    assert store.load().empty
+
+
+def test_restore_keeps_ids_and_skips_stored_ones(store):
+    ids = [store.insert(make_event(i)) for i in range(3)]
+    rows = store.load()
+    store.delete(ids[:2])
+    store.update(ids[2], {"Category": "Result"})
+    assert store.restore(rows) == 2
+    df = store.load().set_index("EventID")
+    assert sorted(df.index) == ids
+    assert df.loc[ids[2], "Category"] == "Result"
+    assert store.insert(make_event(5)) == ids[-1] + 1
+
+
+def test_changes_since_replays_writes(store):
+    ids = [store.insert(make_event(i)) for i in range(8)]
+    seq = store.journal_seq()
+    store.update(ids[0], {"Category": "Result"})
+    store.delete([ids[1]])
+    records, last = store.changes_since(seq)
+    assert [r["op"] for r in records] == ["upsert", "delete"]
+    assert records[0]["rows"][0]["Category"] == "Result"
+    assert records[1]["ids"] == [ids[1]]
+    assert last == store.journal_seq() == seq + 2
+
+
+def test_bulk_writes_are_journaled_as_reset(store):
+    store.insert(make_event(0))
+    seq = store.journal_seq()
+    store.insert_many(apply_schema(pd.DataFrame([make_event(i) for i in range(10)])))
+    records, _ = store.changes_since(seq)
+    assert [r["op"] for r in records] == ["reset"]
+    assert "rows" not in records[0]
+
+
+def test_journal_compaction(store, monkeypatch):
+    monkeypatch.setattr(storage, "JOURNAL_LIMIT", 10)
+    ids = [store.insert(make_event(i)) for i in range(5)]
+    for n in range(20):
+        store.update(ids[n % 5], {"Category": "Result" if n % 2 else "Memo Clearance"})
+    seq = store.journal_seq()
+    assert seq == 25
+    # Everything up to seq 15 was dropped at seq 20
+    assert store.changes_since(0) is None
+    assert store.changes_since(14) is None
+    records, last = store.changes_since(15)
+    assert [r["seq"] for r in records] == list(range(16, 26)) and last == seq
+
+
+def test_csv_insert_after_hand_edits(tmp_path):
+    path = tmp_path / "events.csv"
+    store = open_store(str(path))
+    for i in range(2):
+        store.insert(make_event(i))
+    lines = path.read_text().splitlines()
+    # A hand-added row ahead of the sequence, saved without the final newline
+    lines.append(lines[-1].replace("2,", "7,", 1))
+    path.write_text("\n".join(lines))
+    assert store.insert(make_event(3)) == 8
+    assert store.load()["EventID"].tolist() == [1, 2, 7, 8]
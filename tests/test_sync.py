@@ -0,0 +1,88 @@
+import random
+
+import pandas as pd
+import pytest
+
+from conftest import make_event
+from events_core import storage
+from events_core.schema import CATEGORIES, PROGRAMS, apply_schema
+from events_core.search import SearchIndex
+from events_core.stats import EventStats
+from events_core.sync import LiveEvents
+
+
+def assert_matches_fresh_load(live):
+    fresh = live.store.load().sort_values("EventID", kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(live.df, fresh)
+    assert live.stats.counts() == EventStats(fresh).counts()
+    index = SearchIndex(fresh)
+    for words in ("keam", "allot", "memo nursing", "result"):
+        assert live.search.search(words) == index.search(words)
+
+
+def _random_event(rng, i):
+    return make_event(i, rng.choice(PROGRAMS), rng.choice(CATEGORIES))
+
+
+def _random_write(store, rng, i):
+    ids = store.load()["EventID"].tolist()
+    op = rng.choice(["insert", "insert", "insert_many", "update", "delete"] if ids else ["insert"])
+    if op == "insert":
+        store.insert(_random_event(rng, i))
+    elif op == "insert_many":
+        # Mostly small batches (replayed), sometimes a large one (journaled as a reset)
+        n = rng.choice([1, 2, 3, 40])
+        store.insert_many(apply_schema(pd.DataFrame([_random_event(rng, i + k) for k in range(n)])))
+    elif op == "update":
+        picked = rng.sample(ids, min(len(ids), rng.choice([1, 1, 2, 5])))
+        store.update_many(picked, {"Category": rng.choice(CATEGORIES),
+                                   "Start Time": rng.choice(["9:00 AM", "2:30 PM", ""])})
+    else:
+        store.delete(rng.sample(ids, min(len(ids), rng.choice([1, 2]))))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_live_events_match_a_fresh_load_after_random_writes(store, seed):
+    rng = random.Random(seed)
+    for i in range(20):
+        store.insert(_random_event(rng, i))
+    live = LiveEvents(store)
+    replayed = 0
+    for step in range(120):
+        _random_write(store, rng, 100 + step * 50)
+        if rng.random() < 0.5:
+            reloads = live.reloads
+            live.sync()
+            replayed += live.reloads == reloads
+            assert_matches_fresh_load(live)
+    live.sync()
+    assert_matches_fresh_load(live)
+    # Most syncs applied deltas instead of reloading
+    assert replayed > 30
+
+
+def test_live_events_reload_after_compaction(store, monkeypatch):
+    monkeypatch.setattr(storage, "JOURNAL_LIMIT", 10)
+    ids = [store.insert(make_event(i)) for i in range(10)]
+    live = LiveEvents(store)
+    reloads = live.reloads
+    for n in range(30):
+        store.update(ids[n % 10], {"Category": CATEGORIES[n % len(CATEGORIES)]})
+    live.sync()
+    assert live.reloads == reloads + 1
+    assert_matches_fresh_load(live)
+    store.update(ids[0], {"Category": "Result"})
+    live.sync()
+    assert live.reloads == reloads + 1
+    assert_matches_fresh_load(live)
+
+
+def test_live_events_see_writes_of_another_store_object(store_path):
+    writer = storage.open_store(store_path)
+    writer.insert(make_event(0))
+    live = LiveEvents(storage.open_store(store_path))
+    token = live.token
+    writer.insert(make_event(1))
+    assert live.sync() != token
+    assert len(live.df) == 2
+    assert_matches_fresh_load(live)